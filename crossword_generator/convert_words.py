@@ -1,76 +1,480 @@
+import asyncio
 import json
-import requests
-import time
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Iterator, Tuple
 import re
 import os
+import sqlite3
+from itertools import islice
+import time
+
+try:
+    import aiohttp
+except ImportError:  # senza aiohttp le richieste bloccanti girano in un pool di thread
+    aiohttp = None
+    import requests
+
+try:
+    import orjson
+except ImportError:  # orjson è opzionale: si ripiega sul modulo json standard
+    orjson = None
+
+# Titoli per richiesta: la API accetta fino a 50 titoli, ma TextExtracts restituisce
+# al massimo 20 estratti introduttivi (exintro) per richiesta
+WIKI_BATCH_SIZE = 20
+# Richieste contemporanee verso Wikipedia
+MAX_CONCURRENCY = 20
+# Thread usati per le richieste bloccanti quando aiohttp non è disponibile
+THREAD_WORKERS = 10
+# Intervallo tra due richieste: iniziale, minimo e massimo (secondi)
+RATE_INTERVAL_START = 0.1
+RATE_INTERVAL_MIN = 0.05
+RATE_INTERVAL_MAX = 60.0
+# Tentativi aggiuntivi e backoff per le risposte di errore temporaneo
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Risposte che indicano un server sovraccarico: il limitatore rallenta le richieste
+THROTTLE_STATUSES = {429, 503}
+
+# Parola valida: solo lettere (anche accentate), senza J, K, W, X, Y, da 3 a 15 caratteri
+WORD_RE = re.compile(r"[^\W\d_JKWXY]{3,15}")
+
+# Pulizia delle definizioni: testo tra parentesi e spazi multipli
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_WS_RE = re.compile(r'\s+')
+
+# Difficoltà in base alla lunghezza: 1 fino a 4 lettere, 2 fino a 7, 3 oltre
+_DIFFICULTY_BY_LENGTH = (1, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 3, 3, 3)
+
+# Cache su disco delle definizioni già scaricate (validità: 30 giorni)
+CACHE_FILE = "data/.wiki_cache.sqlite"
+CACHE_EXPIRE = 30 * 86400
+
+# Indice locale titolo -> prima frase ricavato dal dump di Wikipedia
+# (generato da scripts/scripts/prepare_dump.py, facoltativo)
+DUMP_DB = "data/wiki_dump.sqlite"
+
+HEADERS = {
+    "User-Agent": "crossword-generator/1.0",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip",
+    "Connection": "keep-alive"
+}
+
+def loads_json(data: bytes):
+    """Decodifica JSON, usando orjson se disponibile."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_json_line(obj) -> bytes:
+    """Serializza obj come una riga JSON Lines (UTF-8, terminata da newline)."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b"\n"
+
+def dump_json(obj, path: str) -> None:
+    """Salva obj come JSON indentato in UTF-8, usando orjson se disponibile."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+class DefinitionCache:
+    """Cache persistente parola -> definizione, condivisa tra esecuzioni diverse."""
+    
+    def __init__(self, path: str = CACHE_FILE, expire: int = CACHE_EXPIRE):
+        self.expire = expire
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS definitions ("
+            "word TEXT PRIMARY KEY, definition TEXT, fetched_at REAL NOT NULL)"
+        )
+    
+    def get_many(self, words: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Restituisce le definizioni ancora valide presenti in cache.
+        Le parole senza definizione su Wikipedia sono memorizzate come None.
+        """
+        cached: Dict[str, Optional[str]] = {}
+        min_time = time.time() - self.expire
+        unique_words = list(dict.fromkeys(words))
+        # Rispetta il limite di parametri di SQLite
+        for start in range(0, len(unique_words), 500):
+            chunk = unique_words[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT word, definition FROM definitions "
+                f"WHERE word IN ({placeholders}) AND fetched_at >= ?",
+                (*chunk, min_time)
+            )
+            cached.update(rows)
+        return cached
+    
+    def set_many(self, definitions: Dict[str, Optional[str]]) -> None:
+        """Salva (o aggiorna) un gruppo di definizioni."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO definitions (word, definition, fetched_at) VALUES (?, ?, ?)",
+                [(word, definition, now) for word, definition in definitions.items()]
+            )
+    
+    def close(self) -> None:
+        self.conn.close()
+
+class DumpDefinitions:
+    """Definizioni ricavate dal dump di Wikipedia, consultate prima della API."""
+    
+    def __init__(self, path: str = DUMP_DB):
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    
+    @classmethod
+    def open(cls, path: str = DUMP_DB) -> Optional["DumpDefinitions"]:
+        """Apre l'indice se è stato generato, altrimenti restituisce None."""
+        if not os.path.exists(path):
+            return None
+        return cls(path)
+    
+    def get_many(self, words: List[str]) -> Dict[str, str]:
+        """Restituisce le definizioni grezze delle parole presenti nel dump."""
+        found: Dict[str, str] = {}
+        unique_words = list(dict.fromkeys(words))
+        for start in range(0, len(unique_words), 500):
+            chunk = unique_words[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT word, definition FROM defs WHERE word IN ({placeholders})",
+                chunk
+            )
+            found.update(rows)
+        return found
+    
+    def close(self) -> None:
+        self.conn.close()
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Interpreta l'header Retry-After (solo nella forma in secondi)."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+class WikiRateLimiter:
+    """
+    Limitatore di frequenza adattivo (AIMD) condiviso da tutte le richieste.
+    L'intervallo tra due richieste raddoppia quando il server risponde 429 o 503
+    (rispettando Retry-After) e si riduce gradualmente dopo ogni successo.
+    """
+    
+    def __init__(self, min_interval: float = RATE_INTERVAL_START):
+        self.min_interval = min_interval
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self) -> None:
+        """Attende il proprio turno prima di inviare una richiesta."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = self._next_time
+            self._next_time = now + self.min_interval
+    
+    def on_success(self) -> None:
+        self.min_interval = max(RATE_INTERVAL_MIN, self.min_interval * 0.9)
+    
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.min_interval = min(RATE_INTERVAL_MAX,
+                                max(self.min_interval * 2, retry_after or 0.0))
+        if retry_after:
+            self._next_time = max(self._next_time, time.monotonic() + retry_after)
 
 class WikiDictionaryConverter:
     def __init__(self):
         self.base_url = "https://it.wikipedia.org/w/api.php"
-        self.session = requests.Session()
+        self.session = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self.limiter = WikiRateLimiter()
+        self.cache = DefinitionCache()
+        self.dump = DumpDefinitions.open()
+    
+    async def __aenter__(self) -> "WikiDictionaryConverter":
+        if self.session is None and aiohttp is None:
+            # Il GIL viene rilasciato durante le letture dal socket:
+            # più thread possono attendere le risposte in parallelo
+            self.session = requests.Session()
+            self.session.headers.update(HEADERS)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=THREAD_WORKERS)
+            self.session.mount("https://", adapter)
+            self.executor = ThreadPoolExecutor(max_workers=THREAD_WORKERS)
+        elif self.session is None:
+            # Un solo host: tutte le connessioni del pool restano aperte
+            # e riutilizzate, evitando un nuovo handshake TLS a ogni richiesta
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONCURRENCY,
+                limit_per_host=MAX_CONCURRENCY,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(connector=connector, headers=HEADERS)
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+            self.session.close()
+        elif self.session is not None:
+            await self.session.close()
+        self.session = None
+        self.cache.close()
+        if self.dump is not None:
+            self.dump.close()
+    
+    async def _query(self, params: dict) -> dict:
+        """
+        Esegue una richiesta alla API di MediaWiki rispettando concorrenza e limite
+        di frequenza, ripetendola con backoff sugli errori temporanei.
+        Returns:
+            dict: il JSON decodificato
+        """
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                await self.limiter.wait()
+                status, retry_after, body = await self._fetch(self.base_url, params)
+            
+            # Solo le risposte riuscite accorciano l'intervallo; 429 e 503 lo allungano
+            if status in THROTTLE_STATUSES:
+                self.limiter.on_throttle(retry_after)
+            elif 200 <= status < 300:
+                self.limiter.on_success()
+            
+            if status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+                attempt += 1
+                continue
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status} per {self.base_url}")
+            return loads_json(body)
+    
+    async def _fetch(self, url: str, params: Optional[dict]) -> Tuple[int, Optional[float], bytes]:
+        """Scarica una risorsa restituendo codice di stato, Retry-After e corpo della risposta."""
+        if self.executor is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._fetch_blocking, url, params)
+        
+        async with self.session.get(url, params=params) as response:
+            return (response.status, _parse_retry_after(response.headers.get("Retry-After")),
+                    await response.read())
+    
+    def _fetch_blocking(self, url: str, params: Optional[dict]) -> Tuple[int, Optional[float], bytes]:
+        """Versione bloccante di _fetch, eseguita nel pool di thread."""
+        response = self.session.get(url, params=params, timeout=30)
+        return (response.status_code, _parse_retry_after(response.headers.get("Retry-After")),
+                response.content)
+    
+    def _get_local_definitions(self, words: List[str]) -> Dict[str, Optional[str]]:
+        """Cerca le definizioni nel dump e poi nella cache, senza accedere alla rete."""
+        definitions: Dict[str, Optional[str]] = {}
+        if self.dump is not None:
+            for word, text in self.dump.get_many(words).items():
+                definition = self._clean_definition(text)
+                if definition:
+                    definitions[word] = definition[:100]
+        
+        remaining = [word for word in words if word not in definitions]
+        if remaining:
+            definitions.update(self.cache.get_many(remaining))
+        return definitions
     
-    def get_wiki_definition(self, word: str) -> Optional[str]:
-        """Ottiene la definizione da Wikipedia."""
+    async def get_wiki_definitions_batch(self, words: List[str]) -> Dict[str, Optional[str]]:
+        """Ottiene le definizioni da Wikipedia per un gruppo di parole (WIKI_BATCH_SIZE per richiesta)."""
+        definitions = self._get_local_definitions(words)
+        missing = [word for word in dict.fromkeys(words) if word not in definitions]
+        chunks = [missing[start:start + WIKI_BATCH_SIZE]
+                  for start in range(0, len(missing), WIKI_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(self._get_chunk_definitions(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        for chunk, chunk_definitions in zip(chunks, results):
+            if isinstance(chunk_definitions, BaseException):
+                print(f"Errore nel recupero delle definizioni per {', '.join(chunk)}: {str(chunk_definitions)}")
+                continue
+            definitions.update(chunk_definitions)
+        return definitions
+    
+    async def _get_chunk_definitions(self, chunk: List[str]) -> Dict[str, Optional[str]]:
+        """Ottiene le definizioni per un singolo gruppo di al massimo WIKI_BATCH_SIZE parole."""
+        definitions: Dict[str, Optional[str]] = {word: None for word in chunk}
+        
         try:
             params = {
                 "action": "query",
                 "format": "json",
-                "titles": word,
+                "titles": "|".join(chunk),
                 "prop": "extracts",
-                "exintro": True,
-                "explaintext": True,
+                "exintro": 1,
+                "explaintext": 1,
+                "exlimit": "max",
                 "redirects": 1
             }
             
-            response = self.session.get(self.base_url, params=params)
-            data = response.json()
-            
-            pages = data["query"]["pages"]
-            page_id = list(pages.keys())[0]
-            
-            if page_id == "-1":
-                return None
+            data = await self._query(params)
+            query = data.get("query", {})
             
-            text = pages[page_id].get("extract", "")
+            # Risali dal titolo finale alle parole richieste
+            # (normalizzazioni e redirect possono concatenarsi)
+            sources: Dict[str, List[str]] = {}
+            for word in chunk:
+                sources.setdefault(word, []).append(word)
+            for key in ("normalized", "redirects"):
+                for entry in query.get(key, []):
+                    origins = sources.pop(entry["from"], [])
+                    sources.setdefault(entry["to"], []).extend(origins)
             
-            definition = self._clean_definition(text)
-            if definition:
-                return definition[:100]
+            # In cache vanno le definizioni trovate e, come None, solo le parole senza
+            # pagina: un estratto mancante può essere temporaneo e va richiesto di nuovo
+            to_cache: Dict[str, Optional[str]] = {}
+            for page in query.get("pages", {}).values():
+                words = sources.get(page.get("title"), [])
+                if "missing" in page or "invalid" in page:
+                    to_cache.update(dict.fromkeys(words))
+                    continue
+                
+                definition = self._clean_definition(page.get("extract", ""))
+                if not definition:
+                    continue
+                
+                for word in words:
+                    definitions[word] = to_cache[word] = definition[:100]
             
-            return None
+            self.cache.set_many(to_cache)
             
         except Exception as e:
-            print(f"Errore nel recupero della definizione per {word}: {str(e)}")
-            return None
+            print(f"Errore nel recupero delle definizioni per {', '.join(chunk)}: {str(e)}")
+        
+        return definitions
     
     def _clean_definition(self, text: str) -> Optional[str]:
         if not text:
             return None
         
-        sentences = text.split('.')
-        if not sentences:
-            return None
-        
-        first_sentence = sentences[0].strip()
-        first_sentence = re.sub(r'\([^)]*\)', '', first_sentence)
-        first_sentence = re.sub(r'\s+', ' ', first_sentence)
+        # Serve solo la prima frase: evita di spezzare l'intero estratto
+        first_sentence = text.partition('.')[0].strip()
+        first_sentence = _PAREN_RE.sub('', first_sentence)
+        first_sentence = _WS_RE.sub(' ', first_sentence)
         
         return first_sentence.strip()
     
     def estimate_difficulty(self, word: str) -> int:
-        length = len(word)
-        if length <= 4:
-            return 1
-        elif length <= 7:
-            return 2
-        else:
-            return 3
+        return _DIFFICULTY_BY_LENGTH[min(len(word), 15)]
+
+def valid_words(path: str) -> Iterator[str]:
+    """
+    Legge il file riga per riga restituendo solo le parole valide, in maiuscolo.
+    Le parole ripetute (anche con maiuscole diverse) sono restituite una volta sola.
+    """
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word = line.strip().upper()
+            if word not in seen and WORD_RE.fullmatch(word):
+                seen.add(word)
+                yield word
+
+def count_lines(path: str) -> int:
+    """Conta le righe del file senza decodificarlo."""
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+def load_progress(path: str) -> List[dict]:
+    """Legge le voci già salvate nel file JSON Lines di un'esecuzione precedente."""
+    if not os.path.exists(path):
+        return []
+    
+    entries = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                entries.append(loads_json(line))
+            except ValueError:
+                # Riga troncata da un'interruzione: verrà riscaricata (e poi rimossa
+                # da trim_partial_line prima di aggiungere nuove voci)
+                continue
+    return entries
+
+def trim_partial_line(path: str) -> None:
+    """
+    Tronca il file dopo l'ultimo newline, eliminando la riga lasciata a metà da
+    un'interruzione: le nuove voci si aggiungono così su una riga propria.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        # Cerca l'ultimo newline a blocchi partendo dalla fine del file
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+
+async def fetch_definitions(words: List[str], progress_file: str) -> int:
+    """
+    Scarica in parallelo le definizioni di tutte le parole (già senza duplicati),
+    aggiungendo ogni voce trovata al file JSON Lines non appena è disponibile.
+    Returns:
+        int: numero di definizioni trovate
+    """
+    found = 0
+    
+    async with WikiDictionaryConverter() as converter:
+        batches = [words[start:start + WIKI_BATCH_SIZE]
+                   for start in range(0, len(words), WIKI_BATCH_SIZE)]
+        
+        trim_partial_line(progress_file)
+        with open(progress_file, 'ab') as out:
+            for next_batch in asyncio.as_completed(
+                    [converter.get_wiki_definitions_batch(batch) for batch in batches]):
+                definitions = await next_batch
+                
+                for word, definition in definitions.items():
+                    if definition:
+                        out.write(dumps_json_line({
+                            "word": word,
+                            "definition": definition,
+                            "difficulty": converter.estimate_difficulty(word)
+                        }))
+                        found += 1
+                        print(f"✓ {word}: {definition[:50]}...")
+                    else:
+                        print(f"✗ Nessuna definizione trovata per {word}")
+                
+                out.flush()
+    
+    return found
 
 def main():
     # Configura questi percorsi
     input_file = "data/parole_italiane.txt"
     output_file = "data/dizionario.json"
+    # Avanzamento salvato voce per voce: permette di riprendere un'esecuzione interrotta
+    progress_file = "data/dizionario.jsonl"
     max_words = 50
     
     # Verifica che il file esista
@@ -82,70 +486,39 @@ def main():
     
     try:
         # Leggi e mostra alcune statistiche iniziali
-        with open(input_file, 'r', encoding='utf-8') as f:
-            raw_words = f.readlines()
-        
-        print(f"Lette {len(raw_words)} righe dal file")
+        line_count = count_lines(input_file)
+        print(f"Lette {line_count} righe dal file")
         
-        # Pulisci e filtra le parole
-        words = []
-        for line in raw_words:
-            word = line.strip().upper()
-            if word:  # se la parola non è vuota
-                if word.isalpha():  # se contiene solo lettere
-                    if 3 <= len(word) <= 15:  # se ha lunghezza corretta
-                        if not any(c in 'JKWXY' for c in word):  # se non contiene lettere non italiane
-                            words.append(word)
-                        else:
-                            print(f"Scartata (lettere non italiane): {word}")
-                    else:
-                        print(f"Scartata (lunghezza): {word}")
-                else:
-                    print(f"Scartata (non alfabetica): {word}")
+        # Pulisci e filtra le parole, fermandosi al limite richiesto
+        words = list(islice(valid_words(input_file), max_words))
         
-        print(f"\nParole valide trovate: {len(words)}")
+        print(f"\nParole valide selezionate: {len(words)}")
         print("Prime 5 parole:")
         for w in words[:5]:
             print(f"- {w}")
         
-        # Limita il numero di parole
-        words = words[:max_words]
-        total = len(words)
+        # Salta le parole già elaborate in un'esecuzione precedente
+        done = {entry["word"] for entry in load_progress(progress_file)}
+        pending = [w for w in words if w not in done]
+        if done:
+            print(f"\nRiprese {len(done)} definizioni da {progress_file}")
         
-        converter = WikiDictionaryConverter()
-        words_dict = {}
+        print(f"\nProcessando {len(pending)} parole...")
         
-        print(f"\nProcessando {total} parole...")
-        
-        for i, word in enumerate(words, 1):
-            print(f"[{i}/{total}] Processando: {word}")
-            
-            if word not in words_dict:
-                definition = converter.get_wiki_definition(word)
-                if definition:
-                    words_dict[word] = {
-                        "word": word,
-                        "definition": definition,
-                        "difficulty": converter.estimate_difficulty(word)
-                    }
-                    print(f"✓ Definizione trovata: {definition[:50]}...")
-                else:
-                    print(f"✗ Nessuna definizione trovata per {word}")
-                
-                time.sleep(1)
+        asyncio.run(fetch_definitions(pending, progress_file))
         
-        # Salva il risultato
+        # Salva il risultato nel formato atteso {"words": [...]}
+        entries = load_progress(progress_file)
         result = {
-            "words": list(words_dict.values())
+            "words": entries
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        dump_json(result, output_file)
         
         print(f"\nConversione completata!")
-        print(f"Parole totali lette: {len(raw_words)}")
-        print(f"Parole valide trovate: {len(words)}")
-        print(f"Definizioni trovate: {len(words_dict)}")
+        print(f"Parole totali lette: {line_count}")
+        print(f"Parole valide selezionate: {len(words)}")
+        print(f"Definizioni trovate: {len(entries)}")
         print(f"File salvato in: {output_file}")
         
     except Exception as e:
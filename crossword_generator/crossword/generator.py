@@ -8,39 +8,94 @@ Gestisce la creazione di cruciverba con le seguenti caratteristiche:
 - Mantiene tutte le intersezioni valide con definizioni
 """
 
+import os
 import random
-from typing import List, Tuple, Set, Optional
-from .utils import Word, CrosswordCell
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Final, List, Tuple, Set, Optional, Union
+from .utils import (Word, CrosswordCell, WILDCARD, EMPTY, BLACK, FIRST_LETTER,
+                    IS_LETTER, CODES_TO_ASCII, CODES_TO_CHARS, CHARS_TO_CODES, VALID_CHARS,
+                    encode_letter, decode_letter)
+from .kernels import NUMBA_AVAILABLE, line_sequences_are_words, words_fit
+from .index import WordIndex, MAX_WORD_LENGTH
+
+# Tipo degli elementi restituiti da _find_intersections
+INTERSECTION_DTYPE = np.dtype([('row', 'i1'), ('col', 'i1'), ('letter', 'u1'), ('h', '?')])
+
+# Dimensione e dizionario del processo worker, impostati una sola volta dall'initializer
+_worker_generator_args: Tuple[int, Union[List[dict], WordIndex]] = (0, [])
+
+def _init_worker(size: int, words: Union[List[dict], WordIndex]) -> None:
+    """Memorizza dimensione e dizionario nel processo worker (ricevuti una sola volta)."""
+    global _worker_generator_args
+    _worker_generator_args = (size, words)
+
+def _generate_worker(seed: int) -> Tuple[bool, int, dict]:
+    """
+    Esegue un tentativo di generazione in un processo worker.
+    Args:
+        seed: seme del generatore casuale per questo tentativo
+    Returns:
+        Tuple: (successo, numero di parole inserite, stato della griglia)
+    """
+    random.seed(seed)
+    generator = CrosswordGenerator(*_worker_generator_args)
+    success = generator.generate()
+    return success, len(generator.word_positions), generator._export_state()
 
 class CrosswordGenerator:
     #
     # INIZIALIZZAZIONE E SETUP
     #
-    def __init__(self, size: int, words: List[dict]):
+    def __init__(self, size: int, words: Union[List[dict], WordIndex]) -> None:
         """
         Inizializza il generatore di cruciverba.
         Args:
             size: dimensione della griglia (quadrata)
-            words: lista di dizionari contenenti parole e definizioni
-        """
-        self.size = size
-        self.words = []
-        for word_dict in words:
-            word = Word(text=word_dict['word'].upper(), definitions=word_dict['definitions'])
-            if self._is_valid_word(word.text):
-                self.words.append(word)
-        
-        # Ordina le parole per lunghezza (priorità alle parole più lunghe)
-        self.words.sort(key=lambda w: len(w.text), reverse=True)
-        
-        self.grid = [[CrosswordCell() for _ in range(size)] for _ in range(size)]
+            words: lista di dizionari contenenti parole e definizioni,
+                oppure un WordIndex già costruito
+        """
+        self.size: Final[int] = size
+        # Indici del dizionario: condivisi se ne viene passato uno già costruito
+        self.index = words if isinstance(words, WordIndex) else WordIndex(words)
+        self.words = self.index.words
+        self._word_set = self.index.word_set
+        self._word_table = self.index.word_table
+        self._word_codes = self.index.word_codes
+        self._word_lengths = self.index.word_lengths
+        self._word_bytes = self.index.word_bytes
+        self._by_len = self.index.by_len
+        self._by_len_letter_pos = self.index.by_len_letter_pos
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Riporta la griglia allo stato iniziale (tutte le celle vuote, nessuna parola),
+        mantenendo gli indici del dizionario: lo stesso generatore si può riutilizzare.
+        """
+        size = self.size
+        # Lettere in un array compatto (vedi EMPTY, BLACK, FIRST_LETTER);
+        # gli altri attributi delle celle restano negli oggetti di self.grid
+        self.letters = np.zeros((size, size), dtype=np.uint8)
+        # Maschera delle celle nere con un bordo di 2 celle sempre False:
+        # i controlli vicino ai bordi non richiedono verifiche sugli indici
+        self._black = np.zeros((size + 4, size + 4), dtype=np.bool_)
+        # Punti di articolazione e componenti delle lettere, ricalcolati solo dopo una modifica
+        self._connectivity_cache: Optional[Tuple[int, bytearray, List[int], List[int]]] = None
+        # Maschere di bit delle celle nere per riga e per colonna
+        # (bit j = cella j della riga/colonna), aggiornate a ogni scrittura
+        self._black_rows = [0] * size
+        self._black_cols = [0] * size
+        # Righe e colonne modificate dall'ultima validazione e validità di quelle già controllate
+        self._dirty_rows: Set[int] = set(range(size))
+        self._dirty_cols: Set[int] = set(range(size))
+        self._valid_rows = [True] * size
+        self._valid_cols = [True] * size
+        self.grid: List[List[CrosswordCell]] = [[CrosswordCell() for _ in range(size)] for _ in range(size)]
         self.word_positions: List[Tuple[str, int, int, bool, str]] = []
         self.used_words: Set[str] = set()
-
-    def _is_valid_word(self, word: str) -> bool:
-        """Verifica se una parola è valida per il cruciverba."""
-        return (word.isalpha() and 
-                2 <= len(word) <= 15)
+        # Ultime definizioni calcolate, con l'impronta della griglia a cui si riferiscono
+        self._definitions_cache: Optional[Tuple[Tuple[bytes, tuple], Tuple[List[str], List[str]]]] = None
 
     #
     # GENERAZIONE PRINCIPALE
@@ -73,15 +128,53 @@ class CrosswordGenerator:
         
         return False
 
+    @classmethod
+    def generate_parallel(cls, size: int, words: Union[List[dict], WordIndex],
+                          k: Optional[int] = None) -> Tuple['CrosswordGenerator', bool]:
+        """
+        Esegue k tentativi di generazione indipendenti in processi separati.
+        Restituisce il primo cruciverba valido oppure, se nessun tentativo riesce,
+        quello con più parole inserite.
+        Args:
+            size: dimensione della griglia
+            words: lista di dizionari con le parole e le definizioni, oppure un WordIndex
+            k: numero di tentativi (default: numero di CPU)
+        Returns:
+            Tuple: (generatore con la griglia scelta, True se la griglia è valida)
+        """
+        k = k or os.cpu_count() or 1
+        seeds = [random.getrandbits(64) for _ in range(k)]
+        
+        executor = ProcessPoolExecutor(max_workers=k, initializer=_init_worker,
+                                       initargs=(size, words))
+        try:
+            futures = [executor.submit(_generate_worker, seed) for seed in seeds]
+            # Il generatore del processo principale si costruisce mentre i worker lavorano
+            generator = cls(size, words)
+            
+            best: Optional[Tuple[bool, int, dict]] = None
+            for future in as_completed(futures):
+                success, word_count, state = future.result()
+                if best is None or (success, word_count) > best[:2]:
+                    best = (success, word_count, state)
+                if success:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        assert best is not None
+        generator._restore_state(best[2])
+        return generator, best[0]
+
     def _place_first_word(self) -> bool:
         """
         Posiziona la prima parola al centro del cruciverba.
         Returns:
             bool: True se il posizionamento ha successo
         """
-        suitable_words = [w for w in self.words 
-                        if 2 <= len(w.text) <= min(self.size - 2, 8)
-                        and w.text not in self.used_words]
+        suitable_words = [w for length in range(min(self.size - 2, 8), 1, -1)
+                          for w in self._by_len.get(length, ())
+                          if w.text not in self.used_words]
         
         if not suitable_words:
             return False
@@ -100,19 +193,18 @@ class CrosswordGenerator:
             bool: True se l'aggiunta ha successo
         """
         intersections = self._find_intersections()
-        if not intersections:
+        if not intersections.size:
             return False
         
-        random.shuffle(intersections)
-        for row, col, letter, is_horizontal in intersections:
-            possible_words = [w for w in self.words
-                            if letter in w.text
-                            and w.text not in self.used_words
-                            and self._can_place_word(w.text, row, col, is_horizontal, letter)]
+        # Il generatore numpy è seminato da random: con random.seed i risultati restano riproducibili
+        np.random.default_rng(random.getrandbits(64)).shuffle(intersections)
+        for row, col, code, is_horizontal in intersections.tolist():
+            letter = decode_letter(code)
+            possible_words = self._fitting_words(row, col, letter, code, is_horizontal)
             
             if possible_words:
                 word = random.choice(possible_words)
-                offset = word.text.index(letter)
+                offset = word.letter_positions[letter][0]
                 new_row = row if is_horizontal else row - offset
                 new_col = col - offset if is_horizontal else col
                 
@@ -122,6 +214,61 @@ class CrosswordGenerator:
                         return True
         
         return False
+
+    def _fitting_words(self, row: int, col: int, letter: str, code: int, is_horizontal: bool) -> List[Word]:
+        """
+        Restituisce le parole non ancora usate che possono incrociare la cella (row, col).
+        Con numba il controllo di _can_place_word gira compilato su tutti i candidati insieme.
+        """
+        candidates = [w for w in self._candidate_words(row, col, letter, is_horizontal)
+                      if w.text not in self.used_words]
+        if self._word_codes is not None and candidates:
+            ids = np.fromiter([w.id for w in candidates], dtype=np.int32, count=len(candidates))
+            fits = words_fit(self.letters, self._black, self._word_codes, self._word_lengths,
+                             ids, row, col, code, is_horizontal)
+            return [w for w, ok in zip(candidates, fits.tolist()) if ok]
+        return [w for w in candidates
+                if self._can_place_word(w.text, row, col, is_horizontal, w.letter_positions[letter][0])]
+
+    def _candidate_words(self, row: int, col: int, letter: str, is_horizontal: bool) -> List[Word]:
+        """
+        Restituisce le parole che contengono la lettera in una posizione compatibile
+        con lo spazio disponibile attorno all'incrocio e con le lettere già presenti.
+        """
+        before = col if is_horizontal else row
+        candidates: List[Word] = []
+        for length in range(min(self.size, MAX_WORD_LENGTH), 1, -1):
+            # La parola deve stare tra il bordo iniziale e quello finale
+            for offset in range(max(0, length - (self.size - before)), min(before, length - 1) + 1):
+                if is_horizontal:
+                    pattern = self._slot_pattern(row, col - offset, length, True)
+                else:
+                    pattern = self._slot_pattern(row - offset, col, length, False)
+                
+                if pattern is None:
+                    continue
+                if pattern.count(WILDCARD) == length - 1:
+                    # Solo la lettera dell'incrocio è fissata: basta l'indice
+                    candidates.extend(self._by_len_letter_pos.get((length, letter, offset), ()))
+                else:
+                    candidates.extend(w for w in self.index.matches(pattern)
+                                      if w.letter_positions[letter][0] == offset)
+        return candidates
+
+    def _slot_pattern(self, row: int, col: int, length: int, is_horizontal: bool) -> Optional[str]:
+        """
+        Costruisce lo schema delle lettere presenti in uno spazio ('_' = cella vuota).
+        Returns:
+            Optional[str]: lo schema, None se lo spazio contiene una cella nera
+        """
+        cells = self.letters[row, col:col + length] if is_horizontal else self.letters[row:row + length, col]
+        pattern = []
+        for code in cells.tolist():
+            if code == BLACK:
+                return None
+            pattern.append(WILDCARD if code == EMPTY else decode_letter(code))
+        return ''.join(pattern)
+
     #
     # VALIDAZIONE E CONTROLLO
     #
@@ -132,18 +279,9 @@ class CrosswordGenerator:
             bool: True se la griglia è valida
         """
         # Verifica che non ci siano tre celle nere consecutive
-        for i in range(self.size):
-            for j in range(self.size-2):
-                # Controlla orizzontalmente
-                if (self.grid[i][j].letter == '#' and 
-                    self.grid[i][j+1].letter == '#' and 
-                    self.grid[i][j+2].letter == '#'):
-                    return False
-                # Controlla verticalmente
-                if (self.grid[j][i].letter == '#' and 
-                    self.grid[j+1][i].letter == '#' and 
-                    self.grid[j+2][i].letter == '#'):
-                    return False
+        if (any(b & (b >> 1) & (b >> 2) for b in self._black_rows) or
+                any(b & (b >> 1) & (b >> 2) for b in self._black_cols)):
+            return False
         
         # Verifica che ogni sequenza di lettere formi una parola valida
         return self._check_all_letter_sequences()
@@ -154,36 +292,37 @@ class CrosswordGenerator:
         Returns:
             bool: True se tutte le sequenze sono parole valide
         """
-        # Controlla ogni riga
-        for row in range(self.size):
-            word = ""
-            for col in range(self.size):
-                if self.grid[row][col].letter not in [' ', '#']:
-                    word += self.grid[row][col].letter
-                else:
-                    if len(word) >= 2:
-                        if not any(w.text == word for w in self.words):
-                            return False
-                    word = ""
-            if len(word) >= 2 and not any(w.text == word for w in self.words):
-                return False
+        # Ricontrolla solo le righe e le colonne modificate dall'ultima verifica
+        for row in sorted(self._dirty_rows):
+            self._valid_rows[row] = self._line_is_valid(self.letters[row, :])
+        for col in sorted(self._dirty_cols):
+            self._valid_cols[col] = self._line_is_valid(self.letters[:, col])
+        self._dirty_rows.clear()
+        self._dirty_cols.clear()
         
-        # Controlla ogni colonna
-        for col in range(self.size):
-            word = ""
-            for row in range(self.size):
-                if self.grid[row][col].letter not in [' ', '#']:
-                    word += self.grid[row][col].letter
-                else:
-                    if len(word) >= 2:
-                        if not any(w.text == word for w in self.words):
-                            return False
-                    word = ""
-            if len(word) >= 2 and not any(w.text == word for w in self.words):
-                return False
+        return all(self._valid_rows) and all(self._valid_cols)
+
+    def _line_is_valid(self, line: np.ndarray) -> bool:
+        """
+        Verifica che le sequenze di lettere di una riga o colonna siano parole valide.
+        Args:
+            line: codici delle celle della riga o colonna
+        Returns:
+            bool: True se tutte le sequenze sono parole valide
+        """
+        if NUMBA_AVAILABLE:
+            return bool(line_sequences_are_words(line, self._word_table))
         
+        # Un'unica traduzione in ASCII: le celle vuote e nere diventano separatori
+        for sequence in line.tobytes().translate(CODES_TO_ASCII).split():
+            if len(sequence) >= 2 and not self._is_word(sequence):
+                return False
         return True
 
+    def _is_word(self, sequence: bytes) -> bool:
+        """Verifica se la sequenza è una parola del dizionario."""
+        return sequence in self._word_bytes
+
     def _check_adjacent_words(self, word: str, row: int, col: int, is_horizontal: bool) -> bool:
         """
         Verifica che tutte le intersezioni formino parole valide.
@@ -195,10 +334,13 @@ class CrosswordGenerator:
         Returns:
             bool: True se tutte le intersezioni sono valide
         """
+        size = self.size
+        letters = self.letters
+        word_set = self._word_set
         word_length = len(word)
         
         # Prima verifica la parola principale
-        if not any(w.text == word for w in self.words):
+        if word not in word_set:
             return False
         
         if is_horizontal:
@@ -206,28 +348,28 @@ class CrosswordGenerator:
                 current_row = row
                 current_col = col + i
                 
-                if (current_row > 0 and self.grid[current_row-1][current_col].letter != ' ' and 
-                    self.grid[current_row-1][current_col].letter != '#') or \
-                   (current_row < self.size-1 and self.grid[current_row+1][current_col].letter != ' ' and 
-                    self.grid[current_row+1][current_col].letter != '#'):
+                if (current_row > 0 and letters[current_row-1, current_col] != EMPTY and 
+                    letters[current_row-1, current_col] != BLACK) or \
+                   (current_row < size-1 and letters[current_row+1, current_col] != EMPTY and 
+                    letters[current_row+1, current_col] != BLACK):
                     
                     vertical_word = self._get_vertical_word(current_row, current_col, word[i])
                     if vertical_word:
-                        if not any(w.text == vertical_word for w in self.words):
+                        if vertical_word not in word_set:
                             return self._try_add_black_cell(current_row, current_col)
         else:
             for i in range(word_length):
                 current_row = row + i
                 current_col = col
                 
-                if (current_col > 0 and self.grid[current_row][current_col-1].letter != ' ' and 
-                    self.grid[current_row][current_col-1].letter != '#') or \
-                   (current_col < self.size-1 and self.grid[current_row][current_col+1].letter != ' ' and 
-                    self.grid[current_row][current_col+1].letter != '#'):
+                if (current_col > 0 and letters[current_row, current_col-1] != EMPTY and 
+                    letters[current_row, current_col-1] != BLACK) or \
+                   (current_col < size-1 and letters[current_row, current_col+1] != EMPTY and 
+                    letters[current_row, current_col+1] != BLACK):
                     
                     horizontal_word = self._get_horizontal_word(current_row, current_col, word[i])
                     if horizontal_word:
-                        if not any(w.text == horizontal_word for w in self.words):
+                        if horizontal_word not in word_set:
                             return self._try_add_black_cell(current_row, current_col)
         
         return True
@@ -235,21 +377,38 @@ class CrosswordGenerator:
     #
     # GESTIONE DELLA GRIGLIA
     #
-    def _find_intersections(self) -> List[Tuple[int, int, str, bool]]:
+    def _find_intersections(self) -> np.ndarray:
         """
         Trova i possibili punti di intersezione nella griglia.
         Returns:
-            List[Tuple]: lista di tuple (riga, colonna, lettera, è_orizzontale)
-        """
-        intersections = []
-        for row in range(self.size):
-            for col in range(self.size):
-                cell = self.grid[row][col]
-                if cell.letter != ' ' and cell.letter != '#':
-                    if self._can_start_vertical_word(row, col):
-                        intersections.append((row, col, cell.letter, False))
-                    if self._can_start_horizontal_word(row, col):
-                        intersections.append((row, col, cell.letter, True))
+            np.ndarray: array strutturato (INTERSECTION_DTYPE) con riga, colonna,
+                codice della lettera ed è_orizzontale
+        """
+        is_letter = IS_LETTER[self.letters]
+        is_empty = self.letters == EMPTY
+        
+        # Inizio verticale: sopra bordo o non-lettera, sotto una cella vuota
+        above_free = np.ones_like(is_letter)
+        above_free[1:] = ~is_letter[:-1]
+        below_empty = np.zeros_like(is_letter)
+        below_empty[:-1] = is_empty[1:]
+        starts_v = is_letter & above_free & below_empty
+        
+        # Inizio orizzontale: a sinistra bordo o non-lettera, a destra una cella vuota
+        left_free = np.ones_like(is_letter)
+        left_free[:, 1:] = ~is_letter[:, :-1]
+        right_empty = np.zeros_like(is_letter)
+        right_empty[:, :-1] = is_empty[:, 1:]
+        starts_h = is_letter & left_free & right_empty
+        
+        rows_v, cols_v = np.nonzero(starts_v)
+        rows_h, cols_h = np.nonzero(starts_h)
+        intersections = np.empty(len(rows_v) + len(rows_h), dtype=INTERSECTION_DTYPE)
+        intersections['row'] = np.concatenate((rows_v, rows_h))
+        intersections['col'] = np.concatenate((cols_v, cols_h))
+        intersections['letter'] = self.letters[intersections['row'], intersections['col']]
+        intersections['h'][:len(rows_v)] = False
+        intersections['h'][len(rows_v):] = True
         return intersections
 
     def _place_word(self, word: str, row: int, col: int, is_horizontal: bool, definition: str) -> bool:
@@ -270,28 +429,51 @@ class CrosswordGenerator:
         self.word_positions.append((word, row, col, is_horizontal, definition))
         self.used_words.add(word)
         
-        if not self.grid[row][col].number:
-            self.grid[row][col].number = len(self.word_positions)
-        
-        self.grid[row][col].is_start = True
-        if is_horizontal:
-            self.grid[row][col].is_horizontal = True
-        else:
-            self.grid[row][col].is_vertical = True
+        self._mark_word_start(row, col, is_horizontal)
         
         # Posiziona le lettere
         for i, letter in enumerate(word):
             if is_horizontal:
-                self.grid[row][col + i].letter = letter
+                self._set_cell(row, col + i, encode_letter(letter))
             else:
-                self.grid[row + i][col].letter = letter
+                self._set_cell(row + i, col, encode_letter(letter))
         
         # Aggiungi celle nere intorno alla parola
         self._add_black_cells_around_word(row, col, len(word), is_horizontal)
         
         return True
     
-    def _can_place_word(self, word: str, row: int, col: int, is_horizontal: bool, letter: str) -> bool:
+    def _mark_word_start(self, row: int, col: int, is_horizontal: bool) -> None:
+        """
+        Segna la cella iniziale dell'ultima parola di word_positions: la numera
+        (con la posizione della parola) se non ha già un numero e ne imposta la direzione.
+        """
+        cell = self.grid[row][col]
+        if not cell.number:
+            cell.number = len(self.word_positions)
+        cell.is_start = True
+        if is_horizontal:
+            cell.is_horizontal = True
+        else:
+            cell.is_vertical = True
+
+    def restore_words(self, word_positions: List[Tuple[str, int, int, bool, str]]) -> None:
+        """
+        Ripristina le parole di un cruciverba salvato (le lettere vanno impostate a parte):
+        numeri e direzioni delle celle iniziali si ricostruiscono ripercorrendo le parole
+        nell'ordine di inserimento, come in _place_word.
+        Args:
+            word_positions: parole inserite (parola, riga, colonna, orizzontale, definizione)
+        """
+        self.word_positions = []
+        self.used_words = set()
+        for position in word_positions:
+            word, row, col, is_horizontal, _ = position
+            self.word_positions.append(position)
+            self.used_words.add(word)
+            self._mark_word_start(row, col, is_horizontal)
+
+    def _can_place_word(self, word: str, row: int, col: int, is_horizontal: bool, offset: int) -> bool:
         """
         Verifica se una parola può essere posizionata in una data posizione.
         Args:
@@ -299,59 +481,50 @@ class CrosswordGenerator:
             row: riga di partenza
             col: colonna di partenza
             is_horizontal: True se la parola è orizzontale
-            letter: lettera di intersezione
+            offset: posizione nella parola della lettera di intersezione
         Returns:
             bool: True se la parola può essere posizionata
         """
-        offset = word.index(letter)
-        new_row = row if is_horizontal else row - offset
-        new_col = col - offset if is_horizontal else col
-        
-        if not self._is_valid_position(new_row, new_col, word, is_horizontal):
-            return False
+        size = self.size
+        length = len(word)
+        black = self._black
         
-        # Verifica spazio per celle nere
+        # Posizione nella griglia, vincoli di inizio e fine parola e celle da attraversare;
+        # nella maschera con bordo le celle fuori griglia non sono mai nere
         if is_horizontal:
+            new_row, new_col = row, col - offset
+            if not (0 <= new_row < size and 0 <= new_col <= size - length):
+                return False
             # Deve sempre esserci una cella nera o il bordo a sinistra
-            if new_col > 0 and self.grid[new_row][new_col-1].letter not in ['#']:
+            if new_col > 0 and self.letters[new_row, new_col-1] != BLACK:
                 return False
             # Deve esserci spazio per la cella nera a destra
-            if new_col + len(word) < self.size and self.grid[new_row][new_col+len(word)].letter not in [' ', '#']:
+            if new_col + length < size and self.letters[new_row, new_col+length] >= FIRST_LETTER:
                 return False
-                
-            # Verifica che non ci siano celle nere adiacenti sopra o sotto
-            for i in range(len(word)):
-                curr_col = new_col + i
-                # Controlla sopra
-                if new_row > 0 and self.grid[new_row-1][curr_col].letter == '#':
-                    return False
-                # Controlla sotto
-                if new_row < self.size-1 and self.grid[new_row+1][curr_col].letter == '#':
-                    return False
+            cells = self.letters[new_row, new_col:new_col+length].tolist()
+            before = black[new_row + 1, new_col + 2:new_col + 2 + length].tolist()
+            after = black[new_row + 3, new_col + 2:new_col + 2 + length].tolist()
         else:
+            new_row, new_col = row - offset, col
+            if not (0 <= new_col < size and 0 <= new_row <= size - length):
+                return False
             # Deve sempre esserci una cella nera o il bordo sopra
-            if new_row > 0 and self.grid[new_row-1][new_col].letter not in ['#']:
+            if new_row > 0 and self.letters[new_row-1, new_col] != BLACK:
                 return False
             # Deve esserci spazio per la cella nera sotto
-            if new_row + len(word) < self.size and self.grid[new_row+len(word)][new_col].letter not in [' ', '#']:
+            if new_row + length < size and self.letters[new_row+length, new_col] >= FIRST_LETTER:
                 return False
-                
-            # Verifica che non ci siano celle nere adiacenti a destra o sinistra
-            for i in range(len(word)):
-                curr_row = new_row + i
-                # Controlla sinistra
-                if new_col > 0 and self.grid[curr_row][new_col-1].letter == '#':
-                    return False
-                # Controlla destra
-                if new_col < self.size-1 and self.grid[curr_row][new_col+1].letter == '#':
-                    return False
-        
-        # Controllo sovrapposizioni e adiacenze
-        for i in range(len(word)):
-            r = new_row if is_horizontal else new_row + i
-            c = new_col + i if is_horizontal else new_col
-            
-            if self.grid[r][c].letter not in [' ', word[i]]:
+            cells = self.letters[new_row:new_row+length, new_col].tolist()
+            before = black[new_row + 2:new_row + 2 + length, new_col + 1].tolist()
+            after = black[new_row + 2:new_row + 2 + length, new_col + 3].tolist()
+        
+        # Un solo passaggio: niente celle nere adiacenti ai lati della parola
+        # e ogni cella vuota o già occupata dalla stessa lettera
+        for i in range(length):
+            if before[i] or after[i]:
+                return False
+            code = cells[i]
+            if code != EMPTY and code != encode_letter(word[i]):
                 return False
         
         return True
@@ -360,53 +533,69 @@ class CrosswordGenerator:
     #
     # GESTIONE CELLE NERE
     #
-    def _add_black_cells_around_word(self, row: int, col: int, word_length: int, is_horizontal: bool):
+    def _add_black_cells_around_word(self, row: int, col: int, word_length: int, is_horizontal: bool) -> None:
         """
         Aggiunge celle nere prima e dopo la parola, evitando tre celle nere consecutive.
         """
+        size = self.size
+        letters = self.letters
+        
         if is_horizontal:
             # Aggiungi cella nera a sinistra se non crea tre celle nere consecutive
             if col > 0:
-                if not (col > 1 and self.grid[row][col-2].letter == '#'):
-                    self.grid[row][col-1].letter = '#'
+                if not (col > 1 and letters[row, col-2] == BLACK):
+                    self._set_cell(row, col-1, BLACK)
             
             # Aggiungi cella nera a destra se non crea tre celle nere consecutive
-            if col + word_length < self.size:
-                if not (col + word_length < self.size-1 and 
-                       self.grid[row][col+word_length+1].letter == '#'):
-                    self.grid[row][col+word_length].letter = '#'
+            if col + word_length < size:
+                if not (col + word_length < size-1 and 
+                       letters[row, col+word_length+1] == BLACK):
+                    self._set_cell(row, col+word_length, BLACK)
         else:
             # Aggiungi cella nera sopra se non crea tre celle nere consecutive
             if row > 0:
-                if not (row > 1 and self.grid[row-2][col].letter == '#'):
-                    self.grid[row-1][col].letter = '#'
+                if not (row > 1 and letters[row-2, col] == BLACK):
+                    self._set_cell(row-1, col, BLACK)
             
             # Aggiungi cella nera sotto se non crea tre celle nere consecutive
-            if row + word_length < self.size:
-                if not (row + word_length < self.size-1 and 
-                       self.grid[row+word_length+1][col].letter == '#'):
-                    self.grid[row+word_length][col].letter = '#'
+            if row + word_length < size:
+                if not (row + word_length < size-1 and 
+                       letters[row+word_length+1, col] == BLACK):
+                    self._set_cell(row+word_length, col, BLACK)
 
-    def _fix_triple_black_cells(self):
+    def _fix_triple_black_cells(self) -> None:
         """Corregge le sequenze di tre celle nere consecutive."""
         fixed = True
         while fixed:
             fixed = False
-            for i in range(self.size):
-                for j in range(self.size-2):
-                    # Controlla orizzontalmente
-                    if (self.grid[i][j].letter == '#' and 
-                        self.grid[i][j+1].letter == '#' and 
-                        self.grid[i][j+2].letter == '#'):
-                        if self._try_place_short_word(i, j+1, True):
-                            fixed = True
-                    
-                    # Controlla verticalmente
-                    if (self.grid[j][i].letter == '#' and 
-                        self.grid[j+1][i].letter == '#' and 
-                        self.grid[j+2][i].letter == '#'):
-                        if self._try_place_short_word(j+1, i, False):
-                            fixed = True
+            for row, col, is_horizontal in self._find_triple_black_cells():
+                # La griglia cambia durante il ciclo: ricontrolla la tripla
+                if is_horizontal:
+                    still_triple = self._black[row + 2, col + 2:col + 5].all()
+                    middle = (row, col + 1)
+                else:
+                    still_triple = self._black[row + 2:row + 5, col + 2].all()
+                    middle = (row + 1, col)
+                
+                if still_triple and self._try_place_short_word(*middle, is_horizontal):
+                    fixed = True
+
+    def _find_triple_black_cells(self) -> List[Tuple[int, int, bool]]:
+        """
+        Trova tutte le sequenze di tre celle nere consecutive.
+        Returns:
+            List[Tuple]: lista di tuple (riga, colonna della prima cella, è_orizzontale)
+                nello stesso ordine della scansione riga per riga
+        """
+        black = self.letters == BLACK
+        triples = []
+        for row, col in zip(*np.nonzero(black[:, :-2] & black[:, 1:-1] & black[:, 2:])):
+            triples.append((int(row), int(col), True))
+        for row, col in zip(*np.nonzero(black[:-2] & black[1:-1] & black[2:])):
+            triples.append((int(row), int(col), False))
+        # Scansione originale: (i, j) orizzontale in riga i, poi verticale in colonna i
+        triples.sort(key=lambda t: (t[0], t[1], 0) if t[2] else (t[1], t[0], 1))
+        return triples
 
     def _try_place_short_word(self, row: int, col: int, is_horizontal: bool) -> bool:
         """
@@ -414,13 +603,14 @@ class CrosswordGenerator:
         Returns:
             bool: True se è riuscito a inserire una parola
         """
-        short_words = [w for w in self.words if len(w.text) == 2 and w.text not in self.used_words]
-        
-        for word in short_words:
+        for word in self._by_len.get(2, ()):
+            if word.text in self.used_words:
+                continue
             if self._can_place_word_without_conflict(word.text, row, col, is_horizontal):
                 definition = random.choice(word.definitions)
-                self._place_word(word.text, row, col, is_horizontal, definition)
-                return True
+                # _place_word può rifiutare la parola: in quel caso si prova la successiva
+                if self._place_word(word.text, row, col, is_horizontal, definition):
+                    return True
         return False
     
     def _try_add_black_cell(self, row: int, col: int) -> bool:
@@ -440,7 +630,7 @@ class CrosswordGenerator:
             if not self._would_create_triple_black(row, col):
                 # Verifica che la cella nera non isoli parti del cruciverba
                 if self._can_add_black_cell(row, col):
-                    self.grid[row][col].letter = '#'
+                    self._set_cell(row, col, BLACK)
                     return True
         
         return False
@@ -454,43 +644,102 @@ class CrosswordGenerator:
         Returns:
             bool: True se la cella nera può essere aggiunta
         """
-        # Crea una copia temporanea della griglia
-        temp_grid = [[cell.letter for cell in row] for row in self.grid]
-        temp_grid[row][col] = '#'
+        components, articulation_points, component_of, component_sizes = self._connectivity()
         
-        # Trova la prima cella non nera
-        start = None
-        for i in range(self.size):
-            for j in range(self.size):
-                if temp_grid[i][j] not in ['#', ' ']:
-                    start = (i, j)
-                    break
-            if start:
-                break
+        # Una cella vuota o già nera non cambia la connessione tra le lettere
+        if self.letters[row, col] < FIRST_LETTER:
+            return components <= 1
         
-        if not start:
-            return True  # Se non ci sono celle da connettere
+        index = row * self.size + col
+        if components == 1:
+            return not articulation_points[index]
         
-        # DFS per verificare la connettività
-        visited = set()
-        def dfs(r: int, c: int):
-            if (r, c) in visited or r < 0 or r >= self.size or c < 0 or c >= self.size:
-                return
-            if temp_grid[r][c] in ['#', ' ']:
-                return
+        # Griglia già divisa: resta connessa solo se la cella è una componente isolata
+        return components == 2 and component_sizes[component_of[index]] == 1
+
+    def _connectivity(self) -> Tuple[int, bytearray, List[int], List[int]]:
+        """
+        Calcola (e memorizza fino alla prossima modifica della griglia) la struttura
+        di connessione delle celle con lettere, con l'algoritmo di Tarjan iterativo.
+        Returns:
+            Tuple: numero di componenti, punti di articolazione (1 per ogni cella
+                riga*size+colonna che lo è), componente di ogni cella (-1 se non è una
+                lettera) e dimensione di ogni componente
+        """
+        if self._connectivity_cache is not None:
+            return self._connectivity_cache
+        
+        size = self.size
+        is_letter = IS_LETTER[self.letters].ravel().tolist()
+        
+        def neighbors(index: int) -> List[int]:
+            row, col = divmod(index, size)
+            result = []
+            if col < size - 1 and is_letter[index + 1]:
+                result.append(index + 1)
+            if row < size - 1 and is_letter[index + size]:
+                result.append(index + size)
+            if col > 0 and is_letter[index - 1]:
+                result.append(index - 1)
+            if row > 0 and is_letter[index - size]:
+                result.append(index - size)
+            return result
+        
+        # Array preallocati indicizzati per cella: niente dizionari da ridimensionare
+        cell_count = size * size
+        discovery = [-1] * cell_count
+        low = [0] * cell_count
+        component_of = [-1] * cell_count
+        component_sizes: List[int] = []
+        articulation_points = bytearray(cell_count)
+        counter = 0
+        
+        for root in range(cell_count):
+            if not is_letter[root] or discovery[root] >= 0:
+                continue
             
-            visited.add((r, c))
-            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # destra, giù, sinistra, su
-                dfs(r + dr, c + dc)
-        
-        dfs(start[0], start[1])
-        
-        # Conta tutte le celle non nere
-        non_black = sum(1 for i in range(self.size) for j in range(self.size) 
-                    if temp_grid[i][j] not in ['#', ' '])
+            component = len(component_sizes)
+            discovery[root] = low[root] = counter
+            counter += 1
+            component_of[root] = component
+            cells = 1
+            root_children = 0
+            stack = [(root, -1, iter(neighbors(root)))]
+            
+            while stack:
+                cell, parent, pending = stack[-1]
+                descended = False
+                for neighbor in pending:
+                    if discovery[neighbor] < 0:
+                        discovery[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        component_of[neighbor] = component
+                        cells += 1
+                        stack.append((neighbor, cell, iter(neighbors(neighbor))))
+                        descended = True
+                        break
+                    if neighbor != parent:
+                        low[cell] = min(low[cell], discovery[neighbor])
+                
+                if descended:
+                    continue
+                
+                stack.pop()
+                if parent == -1:
+                    continue
+                low[parent] = min(low[parent], low[cell])
+                if parent == root:
+                    root_children += 1
+                elif low[cell] >= discovery[parent]:
+                    articulation_points[parent] = 1
+            
+            if root_children > 1:
+                articulation_points[root] = 1
+            component_sizes.append(cells)
         
-        # Verifica che tutte le celle non nere siano raggiungibili
-        return len(visited) == non_black
+        self._connectivity_cache = (len(component_sizes), articulation_points,
+                                    component_of, component_sizes)
+        return self._connectivity_cache
 
     #
     # UTILITIES E METODI DI SUPPORTO
@@ -501,12 +750,18 @@ class CrosswordGenerator:
         Returns:
             Tuple[List[str], List[str]]: definizioni orizzontali e verticali
         """
+        # Le parole inserite e le lettere identificano la griglia: se non sono cambiate
+        # dall'ultima chiamata il risultato è lo stesso
+        fingerprint = (self.letters.tobytes(), tuple(self.word_positions))
+        if self._definitions_cache is not None and self._definitions_cache[0] == fingerprint:
+            return self._definitions_cache[1]
+        
         horizontal = []
         vertical = []
         
         for word, row, col, is_horizontal, definition in sorted(
             self.word_positions, 
-            key=lambda x: self.grid[x[1]][x[2]].number
+            key=lambda x: self.grid[x[1]][x[2]].number or 0
         ):
             number = self.grid[row][col].number
             if is_horizontal:
@@ -514,7 +769,84 @@ class CrosswordGenerator:
             else:
                 vertical.append(f"{number}. {definition}")
         
-        return horizontal, vertical
+        self._definitions_cache = (fingerprint, (horizontal, vertical))
+        return self._definitions_cache[1]
+
+    def _export_state(self) -> dict:
+        """Restituisce lo stato della griglia in una forma serializzabile."""
+        return {
+            'letters': self.letters.copy(),
+            'grid': self.grid,
+            'word_positions': self.word_positions,
+            'used_words': self.used_words,
+        }
+
+    def _restore_state(self, state: dict) -> None:
+        """Ripristina uno stato prodotto da _export_state."""
+        self._set_all_cells(state['letters'])
+        self.grid = state['grid']
+        self.word_positions = state['word_positions']
+        self.used_words = state['used_words']
+
+    def get_letter(self, row: int, col: int) -> str:
+        """Restituisce il contenuto di una cella: ' ' (vuota), '#' (nera) o la lettera."""
+        return decode_letter(int(self.letters[row, col]))
+
+    def set_letter(self, row: int, col: int, letter: str) -> None:
+        """Imposta il contenuto di una cella: ' ' (vuota), '#' (nera) o una lettera."""
+        self._set_cell(row, col, encode_letter(letter))
+
+    def get_grid_chars(self) -> bytes:
+        """Restituisce la griglia riga per riga come size*size caratteri ASCII (' ', '#' o lettera)."""
+        return self.letters.tobytes().translate(CODES_TO_CHARS)
+
+    def set_grid_chars(self, chars: bytes) -> None:
+        """
+        Imposta tutte le celle da size*size caratteri ASCII (' ', '#' o lettera), riga per riga.
+        Args:
+            chars: contenuto della griglia, come restituito da get_grid_chars
+        """
+        if len(chars) != self.size * self.size:
+            raise ValueError("Dimensione della griglia non valida")
+        if chars.translate(None, VALID_CHARS):
+            raise ValueError("Carattere non valido nella griglia")
+        codes = np.frombuffer(chars.translate(CHARS_TO_CODES), dtype=np.uint8)
+        self._set_all_cells(codes.reshape(self.size, self.size))
+
+    def _set_all_cells(self, codes: np.ndarray) -> None:
+        """Scrive i codici di tutte le celle con una sola copia, ricalcolando le maschere delle celle nere."""
+        size = self.size
+        self.letters[:] = codes
+        black = self.letters == BLACK
+        self._black[2:size + 2, 2:size + 2] = black
+        
+        # Bit j della maschera di una riga = colonna j; di una colonna = riga j.
+        # Interi Python costruiti dai bit impacchettati: nessun limite di 64 celle per lato
+        self._black_rows[:] = [int.from_bytes(bits.tobytes(), 'little')
+                               for bits in np.packbits(black, axis=1, bitorder='little')]
+        self._black_cols[:] = [int.from_bytes(bits.tobytes(), 'little')
+                               for bits in np.packbits(black.T, axis=1, bitorder='little')]
+        
+        self._connectivity_cache = None
+        self._dirty_rows.update(range(size))
+        self._dirty_cols.update(range(size))
+
+    def _set_cell(self, row: int, col: int, code: int) -> None:
+        """Scrive il codice di una cella aggiornando le maschere delle celle nere."""
+        self.letters[row, col] = code
+        is_black = code == BLACK
+        self._black[row + 2, col + 2] = is_black
+        
+        if is_black:
+            self._black_rows[row] |= 1 << col
+            self._black_cols[col] |= 1 << row
+        else:
+            self._black_rows[row] &= ~(1 << col)
+            self._black_cols[col] &= ~(1 << row)
+        
+        self._connectivity_cache = None
+        self._dirty_rows.add(row)
+        self._dirty_cols.add(col)
 
     def _is_valid_position(self, row: int, col: int, word: str, is_horizontal: bool) -> bool:
         """Verifica se una posizione è valida per una parola."""
@@ -525,16 +857,6 @@ class CrosswordGenerator:
             return (0 <= col < self.size and 
                    0 <= row <= self.size - len(word))
 
-    def _can_start_vertical_word(self, row: int, col: int) -> bool:
-        """Verifica se può iniziare una parola verticale."""
-        return (row == 0 or self.grid[row-1][col].letter in [' ', '#']) and \
-               (row < self.size-1) and self.grid[row+1][col].letter == ' '
-
-    def _can_start_horizontal_word(self, row: int, col: int) -> bool:
-        """Verifica se può iniziare una parola orizzontale."""
-        return (col == 0 or self.grid[row][col-1].letter in [' ', '#']) and \
-               (col < self.size-1) and self.grid[row][col+1].letter == ' '
-               
     def _get_vertical_word(self, row: int, col: int, new_letter: str) -> Optional[str]:
         """
         Ricostruisce la parola verticale che si formerebbe.
@@ -545,17 +867,20 @@ class CrosswordGenerator:
         Returns:
             Optional[str]: la parola formata o None
         """
+        size = self.size
+        letters = self.letters
+        
         start_row = row
-        while start_row > 0 and self.grid[start_row-1][col].letter not in [' ', '#']:
+        while start_row > 0 and letters[start_row-1, col] >= FIRST_LETTER:
             start_row -= 1
         
         word = []
         current_row = start_row
-        while current_row < self.size and self.grid[current_row][col].letter not in [' ', '#']:
+        while current_row < size and letters[current_row, col] >= FIRST_LETTER:
             if current_row == row:
                 word.append(new_letter)
             else:
-                word.append(self.grid[current_row][col].letter)
+                word.append(decode_letter(int(letters[current_row, col])))
             current_row += 1
         
         return ''.join(word) if word else None
@@ -570,17 +895,20 @@ class CrosswordGenerator:
         Returns:
             Optional[str]: la parola formata o None
         """
+        size = self.size
+        letters = self.letters
+        
         start_col = col
-        while start_col > 0 and self.grid[row][start_col-1].letter not in [' ', '#']:
+        while start_col > 0 and letters[row, start_col-1] >= FIRST_LETTER:
             start_col -= 1
         
         word = []
         current_col = start_col
-        while current_col < self.size and self.grid[row][current_col].letter not in [' ', '#']:
+        while current_col < size and letters[row, current_col] >= FIRST_LETTER:
             if current_col == col:
                 word.append(new_letter)
             else:
-                word.append(self.grid[row][current_col].letter)
+                word.append(decode_letter(int(letters[row, current_col])))
             current_col += 1
         
         return ''.join(word) if word else None
@@ -596,84 +924,77 @@ class CrosswordGenerator:
         Returns:
             bool: True se la parola può essere posizionata
         """
+        letters = self.letters
+        word_set = self._word_set
+        
         if not self._is_valid_position(row, col, word, is_horizontal):
             return False
         
         # Verifica ogni lettera della parola
-        for i in range(len(word)):
+        for i, letter in enumerate(word):
             r = row if is_horizontal else row + i
             c = col + i if is_horizontal else col
             
             # Verifica la lettera corrente
-            if self.grid[r][c].letter not in [' ', '#']:
+            if letters[r, c] >= FIRST_LETTER:
                 return False
             
             # Verifica che le parole intersecanti siano valide
-            test_grid = [[cell.letter for cell in row] for row in self.grid]
-            test_grid[r][c] = word[i]
-            
-            # Ricostruisci e verifica la parola verticale
-            vert_word = self._get_word_at_position(r, c, False, test_grid)
-            if vert_word and len(vert_word) >= 2:
-                if not any(w.text == vert_word for w in self.words):
+            # (la lettera è considerata già inserita nella cella)
+            vert_word = self._get_word_at_position(r, c, False, letter)
+            if len(vert_word) >= 2:
+                if vert_word not in word_set:
                     return False
             
-            # Ricostruisci e verifica la parola orizzontale
-            horz_word = self._get_word_at_position(r, c, True, test_grid)
-            if horz_word and len(horz_word) >= 2:
-                if not any(w.text == horz_word for w in self.words):
+            horz_word = self._get_word_at_position(r, c, True, letter)
+            if len(horz_word) >= 2:
+                if horz_word not in word_set:
                     return False
         
         return True
 
-    def _get_word_at_position(self, row: int, col: int, is_horizontal: bool, grid) -> Optional[str]:
+    def _get_word_at_position(self, row: int, col: int, is_horizontal: bool, letter: str) -> str:
         """
-        Recupera la parola completa in una data posizione e direzione.
+        Recupera la parola completa che passa per una cella, come se contenesse la lettera data.
+        Legge direttamente dalla griglia, senza crearne una copia.
         Args:
-            row: riga di inizio
-            col: colonna di inizio
+            row: riga della cella
+            col: colonna della cella
             is_horizontal: True se la parola è orizzontale
-            grid: griglia da utilizzare per la verifica
+            letter: lettera da considerare nella cella
         Returns:
-            Optional[str]: la parola trovata o None
+            str: la parola trovata (almeno la lettera stessa)
         """
-        start_row = row
-        start_col = col
+        size = self.size
+        letters = self.letters
+        dr, dc = (0, 1) if is_horizontal else (1, 0)
         
-        if is_horizontal:
-            while start_col > 0 and grid[row][start_col-1] not in [' ', '#']:
-                start_col -= 1
-        else:
-            while start_row > 0 and grid[start_row-1][col] not in [' ', '#']:
-                start_row -= 1
+        before = []
+        r, c = row - dr, col - dc
+        while r >= 0 and c >= 0 and letters[r, c] >= FIRST_LETTER:
+            before.append(decode_letter(int(letters[r, c])))
+            r, c = r - dr, c - dc
         
-        word = []
-        curr_row = start_row
-        curr_col = start_col
+        after = []
+        r, c = row + dr, col + dc
+        while r < size and c < size and letters[r, c] >= FIRST_LETTER:
+            after.append(decode_letter(int(letters[r, c])))
+            r, c = r + dr, c + dc
         
-        while True:
-            if (curr_row >= self.size or curr_col >= self.size or
-                grid[curr_row][curr_col] in [' ', '#']):
-                break
-                
-            word.append(grid[curr_row][curr_col])
-            if is_horizontal:
-                curr_col += 1
-            else:
-                curr_row += 1
-        
-        return ''.join(word) if word else None
+        return ''.join(reversed(before)) + letter + ''.join(after)
 
-    def _fill_empty_spaces(self):
+    def _fill_empty_spaces(self) -> None:
         """Riempie gli spazi vuoti evitando tre celle nere consecutive."""
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col].letter == ' ':
+        size = self.size
+        letters = self.letters
+        for row in range(size):
+            for col in range(size):
+                if letters[row, col] == EMPTY:
                     # Prima prova a inserire una parola corta
                     if not self._try_place_short_word(row, col, True):  # or False if the word should be placed vertically
                         # Se non riesce, verifica se può mettere una cella nera
                         if not self._would_create_triple_black(row, col):
-                            self.grid[row][col].letter = '#'
+                            self._set_cell(row, col, BLACK)
 
     def _would_create_triple_black(self, row: int, col: int) -> bool:
         """
@@ -681,36 +1002,21 @@ class CrosswordGenerator:
         Returns:
             bool: True se si creerebbero tre celle nere consecutive
         """
-        # Controlla orizzontalmente
-        if col > 0 and col < self.size-1:
-            if (self.grid[row][col-1].letter == '#' and 
-                self.grid[row][col+1].letter == '#'):
-                return True
-        
-        if col > 1:
-            if (self.grid[row][col-2].letter == '#' and 
-                self.grid[row][col-1].letter == '#'):
-                return True
-        
-        if col < self.size-2:
-            if (self.grid[row][col+1].letter == '#' and 
-                self.grid[row][col+2].letter == '#'):
-                return True
-        
-        # Controlla verticalmente
-        if row > 0 and row < self.size-1:
-            if (self.grid[row-1][col].letter == '#' and 
-                self.grid[row+1][col].letter == '#'):
-                return True
-        
-        if row > 1:
-            if (self.grid[row-2][col].letter == '#' and 
-                self.grid[row-1][col].letter == '#'):
-                return True
-        
-        if row < self.size-2:
-            if (self.grid[row+1][col].letter == '#' and 
-                self.grid[row+2][col].letter == '#'):
-                return True
-        
-        return False
\ No newline at end of file
+        return (self._creates_triple(self._black_rows[row], col) or
+                self._creates_triple(self._black_cols[col], row))
+
+    @staticmethod
+    def _creates_triple(mask: int, index: int) -> bool:
+        """
+        Verifica se aggiungere il bit index alla maschera forma tre bit consecutivi che lo includono.
+        Args:
+            mask: maschera di bit delle celle nere di una riga o colonna
+            index: posizione della nuova cella nera
+        Returns:
+            bool: True se si forma una tripla contenente la nuova cella
+        """
+        mask |= 1 << index
+        # Il bit k di triples indica una tripla che inizia in k: servono k in [index-2, index]
+        triples = mask & (mask >> 1) & (mask >> 2)
+        low = max(index - 2, 0)
+        return bool((triples >> low) & ((1 << (index - low + 1)) - 1))
\ No newline at end of file
@@ -1,18 +1,45 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import json
+import os
 import pickle
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from .utils import Word
 from .generator import CrosswordGenerator
+from .index import WordIndex
+
+try:
+    import orjson
+except ImportError:  # orjson è opzionale: si ripiega sul modulo json standard
+    orjson = None
+
+DICTIONARY_FILE = 'data/dizionario.json'
+# Dizionario già convertito in oggetti Python, valido finché è più recente del JSON
+DICTIONARY_CACHE = 'data/dizionario.pkl'
+
+# Formato dei file .cw: SAVE_MAGIC, lunghezza dell'intestazione JSON (4 byte little-endian),
+# intestazione (dimensione, data, parole) e griglia come size*size caratteri ASCII
+SAVE_MAGIC = b'CW01'
+
+# Font dei numeri e delle lettere della griglia (convertiti in oggetti Font all'avvio)
+NUMBER_FONT = ('Arial', 8)
+LETTER_FONT = ('Arial', 12, 'bold')
 
 class CrosswordGUI:
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("Cruciverba Italiano")
         self.setup_gui()
-        self.load_dictionary()
+        
+        # Il dizionario e i suoi indici si caricano in background: la finestra compare subito
+        self.word_index: Optional[WordIndex] = None
+        # Un generatore per dimensione, riutilizzato (dopo reset) a ogni generazione o caricamento
+        self._generators: Dict[int, CrosswordGenerator] = {}
+        self._dict_thread = threading.Thread(target=self._bg_load_dict, daemon=True)
+        self._dict_thread.start()
         
     def setup_gui(self):
         """Inizializza l'interfaccia grafica."""
@@ -36,6 +63,14 @@ class CrosswordGUI:
         
         # Stato corrente
         self.current_generator: Optional[CrosswordGenerator] = None
+        # Dimensione della griglia disegnata e, per ogni cella, voce del canvas
+        # (rettangolo, numero, lettera) con il valore mostrato
+        self._drawn_size: Optional[int] = None
+        self._cell_items: Dict[Tuple[int, int], List] = {}
+        self._number_items: Dict[Tuple[int, int], List] = {}
+        self._letter_items: Dict[Tuple[int, int], List] = {}
+        # Coordinate dei bordi delle celle per dimensione della griglia
+        self._coords_cache: Dict[int, List[int]] = {}
         
     def setup_controls(self, parent):
         """Inizializza i controlli."""
@@ -47,13 +82,17 @@ class CrosswordGUI:
         self.size_var = tk.StringVar(value="15")
         ttk.Entry(controls, textvariable=self.size_var, width=5).grid(row=0, column=1)
         
-        # Bottone genera
-        ttk.Button(controls, text="Genera", 
-                  command=self.generate_crossword).grid(row=0, column=2, padx=20)
+        # Bottone genera (abilitato quando il dizionario è caricato)
+        self.generate_button = ttk.Button(controls, text="Genera",
+                                          command=self.generate_crossword, state='disabled')
+        self.generate_button.grid(row=0, column=2, padx=20)
 
     def setup_canvas_and_definitions(self, parent):
         """Inizializza il canvas e le definizioni."""
         self.CELL_SIZE = 40
+        # Font creati una sola volta e condivisi da tutte le voci del canvas
+        self.number_font = tkfont.Font(font=NUMBER_FONT)
+        self.letter_font = tkfont.Font(font=LETTER_FONT)
         self.canvas = tk.Canvas(parent, bg='white')
         self.canvas.grid(row=1, column=0, padx=(0, 10))
         
@@ -66,110 +105,240 @@ class CrosswordGUI:
         
         # Tab orizzontali
         self.horizontal_frame = ttk.Frame(self.def_notebook)
-        self.horizontal_text = tk.Text(self.horizontal_frame, width=30, height=20)
+        self.horizontal_text = tk.Text(self.horizontal_frame, width=30, height=20, state='disabled')
         self.horizontal_text.grid(sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Tab verticali
         self.vertical_frame = ttk.Frame(self.def_notebook)
-        self.vertical_text = tk.Text(self.vertical_frame, width=30, height=20)
+        self.vertical_text = tk.Text(self.vertical_frame, width=30, height=20, state='disabled')
         self.vertical_text.grid(sticky=(tk.W, tk.E, tk.N, tk.S))
         
         self.def_notebook.add(self.horizontal_frame, text='Orizzontali')
         self.def_notebook.add(self.vertical_frame, text='Verticali')
         
-    def load_dictionary(self):
-        """Carica il dizionario delle parole."""
+        # Testi delle definizioni non ancora mostrati, per indice di tab: la tab
+        # nascosta si riempie solo quando viene selezionata
+        self._def_texts = (self.horizontal_text, self.vertical_text)
+        self._pending_defs: Dict[int, List[str]] = {}
+        self.def_notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        
+    def load_dictionary(self) -> list:
+        """
+        Carica il dizionario delle parole.
+        Returns:
+            list: le parole con le definizioni
+        """
+        words = self._load_cached_dictionary()
+        if words is None:
+            # Letto come bytes: orjson decodifica direttamente l'UTF-8
+            with open(DICTIONARY_FILE, 'rb') as f:
+                data = f.read()
+            # Il file è direttamente un array di oggetti
+            words = orjson.loads(data) if orjson is not None else json.loads(data)
+            self._save_cached_dictionary(words)
+        print(f"Caricate {len(words)} parole dal dizionario")
+        return words
+
+    def _bg_load_dict(self):
+        """
+        Carica il dizionario e ne costruisce gli indici (una sola volta, condivisi da
+        tutti i generatori) nel thread secondario, poi passa il risultato al thread di Tk.
+        """
+        error = None
         try:
-            with open('data/dizionario.json', 'r', encoding='utf-8') as f:
-                # Il file è direttamente un array di oggetti
-                self.words = json.load(f)
-                print(f"Caricate {len(self.words)} parole dal dizionario")
-                    
+            word_index = WordIndex(self.load_dictionary())
         except FileNotFoundError:
-            messagebox.showerror("Errore", "File dizionario.json non trovato!")
-            self.words = []
+            word_index, error = WordIndex([]), "File dizionario.json non trovato!"
         except Exception as e:
-            messagebox.showerror("Errore", f"Errore nel caricamento del dizionario: {str(e)}")
-            self.words = []
+            word_index, error = WordIndex([]), f"Errore nel caricamento del dizionario: {str(e)}"
+        self.root.after(0, self._on_dict_ready, word_index, error)
+
+    def _on_dict_ready(self, word_index: WordIndex, error: Optional[str]):
+        """Rende disponibile il dizionario (eseguito nel thread di Tk)."""
+        self.word_index = word_index
+        if error:
+            messagebox.showerror("Errore", error)
+        else:
+            self.generate_button.config(state='normal')
+
+    def _load_cached_dictionary(self) -> Optional[list]:
+        """
+        Legge il dizionario dalla cache pickle, se è aggiornata rispetto al JSON.
+        Returns:
+            Optional[list]: le parole, o None se la cache manca, è vecchia o illeggibile
+        """
+        try:
+            if os.path.getmtime(DICTIONARY_CACHE) < os.path.getmtime(DICTIONARY_FILE):
+                return None
+            with open(DICTIONARY_CACHE, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _save_cached_dictionary(self, words: list):
+        """Salva il dizionario nella cache pickle (senza cache si rilegge il JSON)."""
+        try:
+            with open(DICTIONARY_CACHE, 'wb') as f:
+                pickle.dump(words, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Impossibile salvare la cache del dizionario: {e}")
         
     def generate_crossword(self):
         """Genera un nuovo cruciverba."""
-        try:
-            size = int(self.size_var.get())
-            if not (5 <= size <= 20):
-                raise ValueError("Dimensione deve essere tra 5 e 20")
-        except ValueError:
-            messagebox.showerror("Errore", "Dimensione non valida!")
+        if self.word_index is None:
+            messagebox.showinfo("Attendere", "Caricamento del dizionario in corso...")
             return
         
-        self.current_generator = CrosswordGenerator(size, self.words)
+        text = self.size_var.get().strip()
+        size = int(text) if text.isdecimal() else 0
+        if not (5 <= size <= 20):
+            messagebox.showerror("Errore", "Dimensione non valida! Deve essere tra 5 e 20")
+            return
+        
+        self.current_generator = self._get_generator(size)
         if self.current_generator.generate():
             self.draw_grid()
             self.update_definitions()
         else:
             messagebox.showerror("Errore", "Impossibile generare il cruciverba!")
     
+    def _get_generator(self, size: int) -> CrosswordGenerator:
+        """
+        Restituisce il generatore per la dimensione data, svuotato e pronto all'uso.
+        Ogni dimensione ne ha uno solo, creato la prima volta che serve.
+        """
+        generator = self._generators.get(size)
+        if generator is None:
+            generator = self._generators[size] = CrosswordGenerator(size, self.word_index)
+        else:
+            generator.reset()
+        return generator
+
     def draw_grid(self):
-        """Disegna la griglia del cruciverba."""
+        """
+        Disegna la griglia del cruciverba. Le voci del canvas si creano solo quando
+        cambia la dimensione; altrimenti si riconfigurano soltanto le celle cambiate.
+        """
         if not self.current_generator:
             return
         
         size = self.current_generator.size
-        canvas_size = size * self.CELL_SIZE
+        if size != self._drawn_size:
+            self._create_grid_items(size)
+        self._update_grid_items()
+
+    def _create_grid_items(self, size: int):
+        """
+        Ricrea tutte le voci del canvas per una griglia della dimensione data:
+        per ogni cella un rettangolo, un numero e una lettera (inizialmente vuoti),
+        più le linee della griglia. _update_grid_items le riempie.
+        Args:
+            size: dimensione della griglia
+        """
+        coords = self._grid_coords(size)
+        canvas_size = coords[size]
         
         self.canvas.delete("all")
         self.canvas.config(width=canvas_size, height=canvas_size)
         
+        cell_options = {'fill': 'white', 'outline': 'white'}
+        self._cell_items = {}
         for row in range(size):
             for col in range(size):
-                x1 = col * self.CELL_SIZE
-                y1 = row * self.CELL_SIZE
-                x2 = x1 + self.CELL_SIZE
-                y2 = y1 + self.CELL_SIZE
-                
-                cell = self.current_generator.grid[row][col]
-                
-                # Disegna cella
-                fill_color = 'black' if cell.letter == '#' else 'white'
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color)
-                
-                # Disegna numero
-                if cell.number:
-                    self.canvas.create_text(
-                        x1 + 2, y1 + 2,
-                        text=str(cell.number),
-                        anchor=tk.NW,
-                        font=('Arial', 8)
-                    )
-                
-                # Disegna lettera
-                if cell.letter not in [' ', '#']:
-                    self.canvas.create_text(
-                        x1 + self.CELL_SIZE/2,
-                        y1 + self.CELL_SIZE/2,
-                        text=cell.letter,
-                        font=('Arial', 12, 'bold'),
-                        fill='black' if fill_color == 'white' else 'white'
-                    )
+                item = self.canvas.create_rectangle(coords[col], coords[row],
+                                                    coords[col + 1], coords[row + 1],
+                                                    **cell_options)
+                self._cell_items[(row, col)] = [item, 'white']
+        
+        # Linee della griglia: una spezzata per le orizzontali e una per le verticali
+        horizontal_lines = []
+        vertical_lines = []
+        for i, pos in enumerate(coords):
+            start, end = (0, canvas_size) if i % 2 == 0 else (canvas_size, 0)
+            horizontal_lines.extend((start, pos, end, pos))
+            vertical_lines.extend((pos, start, pos, end))
+        self.canvas.create_line(*horizontal_lines)
+        self.canvas.create_line(*vertical_lines)
+        
+        number_options = {'anchor': tk.NW, 'font': self.number_font, 'text': ''}
+        letter_options = {'font': self.letter_font, 'fill': 'black', 'text': ''}
+        # Coordinate intere: il centro della cella senza aritmetica in virgola mobile
+        half = self.CELL_SIZE // 2
+        self._number_items = {}
+        self._letter_items = {}
+        for row in range(size):
+            for col in range(size):
+                item = self.canvas.create_text(coords[col] + 2, coords[row] + 2, **number_options)
+                self._number_items[(row, col)] = [item, '']
+                item = self.canvas.create_text(coords[col] + half, coords[row] + half,
+                                               **letter_options)
+                self._letter_items[(row, col)] = [item, '']
+        self._drawn_size = size
+
+    def _grid_coords(self, size: int) -> List[int]:
+        """Restituisce (calcolandole una volta per dimensione) le coordinate dei bordi delle celle."""
+        coords = self._coords_cache.get(size)
+        if coords is None:
+            coords = self._coords_cache[size] = [i * self.CELL_SIZE for i in range(size + 1)]
+        return coords
+
+    def _update_grid_items(self):
+        """Riconfigura solo le voci del canvas il cui contenuto è cambiato."""
+        generator = self.current_generator
+        itemconfigure = self.canvas.itemconfigure
+        for (row, col), cell_entry in self._cell_items.items():
+            letter = generator.get_letter(row, col)
+            fill = 'black' if letter == '#' else 'white'
+            if fill != cell_entry[1]:
+                itemconfigure(cell_entry[0], fill=fill, outline=fill)
+                cell_entry[1] = fill
+            
+            number = generator.grid[row][col].number
+            number = str(number) if number else ''
+            number_entry = self._number_items[(row, col)]
+            if number != number_entry[1]:
+                itemconfigure(number_entry[0], text=number)
+                number_entry[1] = number
+            
+            letter = '' if letter == '#' else letter.strip()
+            letter_entry = self._letter_items[(row, col)]
+            if letter != letter_entry[1]:
+                itemconfigure(letter_entry[0], text=letter)
+                letter_entry[1] = letter
     
     def update_definitions(self):
         """Aggiorna le definizioni nelle tabs."""
         if not self.current_generator:
             return
         
-        # Pulisci le definizioni esistenti
-        self.horizontal_text.delete('1.0', tk.END)
-        self.vertical_text.delete('1.0', tk.END)
-        
         # Ottieni le definizioni ordinate
         horizontal_defs, vertical_defs = self.current_generator.get_definitions()
         
-        # Inserisci le definizioni
-        for definition in horizontal_defs:
-            self.horizontal_text.insert(tk.END, f"{definition}\n")
-        
-        for definition in vertical_defs:
-            self.vertical_text.insert(tk.END, f"{definition}\n")
+        # Riempie solo la tab visibile, l'altra resta in attesa di essere selezionata
+        self._pending_defs = {0: horizontal_defs, 1: vertical_defs}
+        self._flush_current_tab()
+
+    def _on_tab_changed(self, event=None):
+        """Riempie la tab appena selezionata se le sue definizioni sono in attesa."""
+        self._flush_current_tab()
+
+    def _flush_current_tab(self):
+        """Scrive le definizioni in attesa della tab corrente."""
+        current = self.def_notebook.index('current')
+        lines = self._pending_defs.pop(current, None)
+        if lines is not None:
+            self._set_text(self._def_texts[current], lines)
+
+    def _set_text(self, widget: tk.Text, lines: List[str]):
+        """
+        Sostituisce il contenuto di un widget Text con un solo inserimento.
+        Il widget resta in sola lettura tra un aggiornamento e l'altro.
+        """
+        widget.config(state='normal')
+        widget.delete('1.0', tk.END)
+        if lines:
+            widget.insert('1.0', '\n'.join(lines) + '\n')
+        widget.config(state='disabled')
     
     def save_crossword(self):
         """Salva il cruciverba corrente."""
@@ -177,10 +346,10 @@ class CrosswordGUI:
             messagebox.showwarning("Attenzione", "Nessun cruciverba da salvare!")
             return
         
+        size = self.current_generator.size
         save_data = {
-            'size': self.current_generator.size,
-            'grid': [[cell.letter for cell in row] 
-                    for row in self.current_generator.grid],
+            'size': size,
+            'grid': self.current_generator.get_grid_chars(),
             'word_positions': self.current_generator.word_positions,
             'date_created': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
@@ -194,7 +363,7 @@ class CrosswordGUI:
         if filename:
             try:
                 with open(filename, 'wb') as f:
-                    pickle.dump(save_data, f)
+                    f.write(encode_save(save_data))
                 messagebox.showinfo("Successo", "Cruciverba salvato correttamente!")
             except Exception as e:
                 messagebox.showerror("Errore", f"Errore nel salvataggio: {str(e)}")
@@ -206,20 +375,23 @@ class CrosswordGUI:
         )
         
         if filename:
+            if self.word_index is None:
+                messagebox.showinfo("Attendere", "Caricamento del dizionario in corso...")
+                return
+            
             try:
                 with open(filename, 'rb') as f:
-                    save_data = pickle.load(f)
+                    save_data = decode_save(f.read())
                 
-                # Ricrea il generatore
+                # Riutilizza il generatore della stessa dimensione
                 size = save_data['size']
-                self.current_generator = CrosswordGenerator(size, self.words)
+                self.current_generator = self._get_generator(size)
                 
-                # Ripristina lo stato
-                for i in range(size):
-                    for j in range(size):
-                        self.current_generator.grid[i][j].letter = save_data['grid'][i][j]
+                # Ripristina lo stato: tutte le lettere con una sola copia
+                self.current_generator.set_grid_chars(save_data['grid'])
                 
-                self.current_generator.word_positions = save_data['word_positions']
+                # Numeri delle celle e parole usate si ricavano dalle parole inserite
+                self.current_generator.restore_words(save_data['word_positions'])
                 
                 # Aggiorna GUI
                 self.size_var.set(str(size))
@@ -231,6 +403,50 @@ class CrosswordGUI:
             except Exception as e:
                 messagebox.showerror("Errore", f"Errore nel caricamento: {str(e)}")
 
+def encode_save(save_data: dict) -> bytes:
+    """
+    Serializza un cruciverba nel formato compatto dei file .cw.
+    Args:
+        save_data: dizionario con size, grid (size*size caratteri ASCII), word_positions e date_created
+    Returns:
+        bytes: contenuto del file
+    """
+    header = json.dumps({
+        'size': save_data['size'],
+        'date_created': save_data['date_created'],
+        'word_positions': save_data['word_positions'],
+    }).encode('utf-8')
+    return SAVE_MAGIC + len(header).to_bytes(4, 'little') + header + save_data['grid']
+
+def decode_save(data: bytes) -> dict:
+    """
+    Legge un file .cw nel formato compatto o, per i file salvati con le versioni
+    precedenti, nel vecchio formato pickle.
+    Args:
+        data: contenuto del file
+    Returns:
+        dict: size, grid (size*size caratteri ASCII), word_positions e date_created
+    """
+    if not data.startswith(SAVE_MAGIC):
+        # Vecchio formato: griglia come lista di righe di caratteri
+        save_data = pickle.loads(data)
+        save_data['grid'] = ''.join(''.join(row) for row in save_data['grid']).encode('ascii')
+        return save_data
+    
+    start = len(SAVE_MAGIC) + 4
+    header_end = start + int.from_bytes(data[len(SAVE_MAGIC):start], 'little')
+    header = json.loads(data[start:header_end])
+    size = header['size']
+    grid = data[header_end:header_end + size * size]
+    if len(grid) != size * size:
+        raise ValueError("File del cruciverba incompleto")
+    return {
+        'size': size,
+        'grid': grid,
+        'word_positions': [tuple(position) for position in header['word_positions']],
+        'date_created': header['date_created'],
+    }
+
 def main():
     root = tk.Tk()
     app = CrosswordGUI(root)
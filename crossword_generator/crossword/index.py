@@ -0,0 +1,134 @@
+"""
+Indice del dizionario condiviso dai generatori di cruciverba.
+Si costruisce una sola volta per dizionario: tutti i generatori (di qualsiasi
+dimensione) lo riusano invece di ricalcolare insiemi, bitset e tabelle.
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from .utils import Word, WILDCARD
+from .kernels import NUMBA_AVAILABLE, encode_word_codes, encode_word_table
+
+# Lunghezza massima delle parole accettate dal generatore
+MAX_WORD_LENGTH = 15
+# Schemi di ricerca memorizzati da WordIndex.matches (i meno usati di recente escono per primi)
+MATCHES_CACHE_SIZE = 4096
+
+class WordIndex:
+    def __init__(self, words: List[dict]) -> None:
+        """
+        Costruisce gli indici delle parole valide del dizionario.
+        Args:
+            words: lista di dizionari contenenti parole e definizioni
+        """
+        # Testi internati: Word.text, gli insiemi e used_words condividono un solo oggetto
+        # per parola e i confronti si risolvono per identità. Le definizioni no: sono
+        # quasi tutte diverse e la tabella degli internati costerebbe più del risparmio
+        self.words: List[Word] = []
+        for word_dict in words:
+            text = sys.intern(word_dict['word'].upper())
+            if self.is_valid_word(text):
+                self.words.append(Word(text=text, definitions=word_dict['definitions']))
+
+        # Ordina le parole per lunghezza (priorità alle parole più lunghe)
+        self.words.sort(key=lambda w: len(w.text), reverse=True)
+        for i, w in enumerate(self.words):
+            w.id = i
+
+        # Insieme dei testi per verificare in O(1) se una sequenza è una parola
+        self.word_set: Set[str] = {w.text for w in self.words}
+        # Stesse parole in forma tabellare per la validazione compilata con numba
+        self.word_table: Optional[np.ndarray] = (encode_word_table(list(self.word_set), MAX_WORD_LENGTH)
+                                                 if NUMBA_AVAILABLE else None)
+        # Codici di ogni parola per id (ordine di self.words), per filtrare i candidati con numba
+        self.word_codes: Optional[np.ndarray] = None
+        self.word_lengths: Optional[np.ndarray] = None
+        if NUMBA_AVAILABLE:
+            self.word_codes = encode_word_codes([w.text for w in self.words], MAX_WORD_LENGTH)
+            self.word_lengths = np.array([len(w.text) for w in self.words], dtype=np.uint8)
+        # Stesse parole come bytes ASCII, confrontabili direttamente con le righe della griglia
+        self.word_bytes: Set[bytes] = {text.encode('ascii') for text in self.word_set}
+
+        # Parole raggruppate per lunghezza (stesso ordine di self.words)
+        self.by_len: Dict[int, List[Word]] = {}
+        for w in self.words:
+            self.by_len.setdefault(len(w.text), []).append(w)
+
+        # Indice (lunghezza, lettera, posizione) -> parole, dove la posizione è la
+        # prima occorrenza della lettera (quella usata per l'incrocio)
+        self.by_len_letter_pos: Dict[Tuple[int, str, int], List[Word]] = {}
+        for w in self.words:
+            for letter, positions in w.letter_positions.items():
+                key = (len(w.text), letter, positions[0])
+                self.by_len_letter_pos.setdefault(key, []).append(w)
+
+        # Bitset (lunghezza, posizione, lettera) -> parole di quella lunghezza con la lettera
+        # in quella posizione: il bit i corrisponde a by_len[lunghezza][i]. Solo le chiavi
+        # presenti nel dizionario, per cercare le parole compatibili con uno schema
+        self.letter_bits: Dict[Tuple[int, int, str], np.ndarray] = {}
+        for length, group in self.by_len.items():
+            letters = np.frombuffer(b''.join(w.text.encode('ascii') for w in group),
+                                    dtype=np.uint8).reshape(len(group), length)
+            for pos in range(length):
+                column = letters[:, pos]
+                for code in np.unique(column).tolist():
+                    self.letter_bits[(length, pos, chr(code))] = self._pack_bits(column == code)
+        # Risultati delle ricerche per schema: gli stessi schemi si ripresentano spesso.
+        # L'indice vive quanto la sessione, quindi la cache ha una dimensione massima
+        self._matches_cache: "OrderedDict[str, List[Word]]" = OrderedDict()
+
+    def __getstate__(self) -> dict:
+        """Stato da serializzare per i worker: la cache degli schemi non viene copiata."""
+        state = self.__dict__.copy()
+        state['_matches_cache'] = OrderedDict()
+        return state
+
+    @staticmethod
+    def is_valid_word(word: str) -> bool:
+        """Verifica se una parola è valida per il cruciverba."""
+        return (word.isascii() and word.isalpha() and
+                2 <= len(word) <= MAX_WORD_LENGTH)
+
+    @staticmethod
+    def _pack_bits(flags: np.ndarray) -> np.ndarray:
+        """Impacchetta un array di booleani in un bitset uint64 (bit i = elemento i)."""
+        packed = np.packbits(flags, bitorder='little')
+        packed = np.pad(packed, (0, -len(packed) % 8))
+        return packed.view(np.uint64)
+
+    def matches(self, pattern: str) -> List[Word]:
+        """
+        Restituisce (memorizzandole) le parole compatibili con uno schema come "C_TT_",
+        nell'ordine di self.words. La lista restituita è condivisa e non va modificata.
+        """
+        cache = self._matches_cache
+        result = cache.get(pattern)
+        if result is None:
+            result = cache[pattern] = self._match_bits(pattern)
+            if len(cache) > MATCHES_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(pattern)
+        return result
+
+    def _match_bits(self, pattern: str) -> List[Word]:
+        """Interseca con AND i bitset delle lettere fissate nello schema."""
+        length = len(pattern)
+        group = self.by_len.get(length, [])
+        candidates: Optional[np.ndarray] = None
+        for pos, letter in enumerate(pattern):
+            if letter == WILDCARD:
+                continue
+            bits = self.letter_bits.get((length, pos, letter))
+            if bits is None:
+                return []
+            if candidates is None:
+                candidates = bits.copy()
+            else:
+                candidates &= bits
+        if candidates is None:
+            return list(group)
+        positions = np.flatnonzero(np.unpackbits(candidates.view(np.uint8), bitorder='little'))
+        return [group[i] for i in positions.tolist()]
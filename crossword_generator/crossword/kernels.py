@@ -0,0 +1,121 @@
+"""
+Funzioni compilate con numba (se disponibile) per la validazione della griglia
+e il filtro delle parole candidate.
+Restano in un modulo separato perché generator.py e utils.py possano essere
+compilati con mypyc: numba può decorare solo funzioni Python.
+"""
+
+from typing import Any, List
+import numpy as np
+from .utils import EMPTY, BLACK, FIRST_LETTER
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba è opzionale: senza, la validazione resta in Python
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args: Any, **kwargs: Any) -> Any:  # type: ignore[no-redef]
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+def encode_word_table(texts: List[str], width: int) -> np.ndarray:
+    """
+    Codifica le parole in una tabella ordinata (N, width) di codici uint8,
+    completando le parole più corte con EMPTY; l'ordine delle righe è lessicografico.
+    """
+    return encode_word_codes(sorted(texts), width)
+
+def encode_word_codes(texts: List[str], width: int) -> np.ndarray:
+    """Codifica le parole, nell'ordine dato, in una tabella (N, width) di codici uint8."""
+    # '?' precede 'A' di esattamente FIRST_LETTER: dopo la sottrazione diventa EMPTY
+    padded = b''.join(t.encode('ascii').ljust(width, b'?') for t in texts)
+    table = np.frombuffer(padded, dtype=np.uint8).reshape(len(texts), width)
+    return table - np.uint8(ord('A') - FIRST_LETTER)
+
+@njit(cache=True)
+def word_exists(table, buf, length):
+    """Ricerca binaria della sequenza buf[:length] nella tabella delle parole."""
+    lo = 0
+    hi = table.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        cmp = 0
+        for k in range(table.shape[1]):
+            a = buf[k] if k < length else EMPTY
+            b = table[mid, k]
+            if a != b:
+                cmp = -1 if a < b else 1
+                break
+        if cmp == 0:
+            return True
+        if cmp < 0:
+            hi = mid
+        else:
+            lo = mid + 1
+    return False
+
+@njit(cache=True)
+def line_sequences_are_words(line, table):
+    """Verifica che ogni sequenza di almeno due lettere in una riga o colonna sia una parola."""
+    size = line.shape[0]
+    buf = np.zeros(size, dtype=np.uint8)
+    length = 0
+    for j in range(size + 1):
+        code = line[j] if j < size else EMPTY
+        if code >= FIRST_LETTER:
+            buf[length] = code
+            length += 1
+        else:
+            if length >= 2 and (length > table.shape[1] or
+                                not word_exists(table, buf, length)):
+                return False
+            length = 0
+    return True
+
+@njit(cache=True)
+def words_fit(letters, black, codes, lengths, ids, row, col, code, is_horizontal):
+    """
+    Per ogni parola candidata (id nella tabella codes) verifica se può incrociare la
+    cella (row, col) con la lettera code, come CrosswordGenerator._can_place_word;
+    l'incrocio è sulla prima occorrenza della lettera nella parola.
+    """
+    size = letters.shape[0]
+    fits = np.zeros(ids.shape[0], dtype=np.bool_)
+    for n in range(ids.shape[0]):
+        word = ids[n]
+        length = lengths[word]
+        offset = 0
+        while codes[word, offset] != code:
+            offset += 1
+        if is_horizontal:
+            r, c, dr, dc = row, col - offset, 0, 1
+            if c < 0 or c > size - length:
+                continue
+            if c > 0 and letters[r, c - 1] != BLACK:
+                continue
+            if c + length < size and letters[r, c + length] >= FIRST_LETTER:
+                continue
+        else:
+            r, c, dr, dc = row - offset, col, 1, 0
+            if r < 0 or r > size - length:
+                continue
+            if r > 0 and letters[r - 1, c] != BLACK:
+                continue
+            if r + length < size and letters[r + length, c] >= FIRST_LETTER:
+                continue
+        ok = True
+        for i in range(length):
+            rr = r + i * dr
+            cc = c + i * dc
+            # Maschera con bordo di 2: i lati della parola sono a ±1 in direzione trasversale
+            if black[rr + 2 - dc, cc + 2 - dr] or black[rr + 2 + dc, cc + 2 + dr]:
+                ok = False
+                break
+            cell = letters[rr, cc]
+            if cell != EMPTY and cell != codes[word, i]:
+                ok = False
+                break
+        fits[n] = ok
+    return fits
@@ -1,15 +1,66 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Final, List, Dict, Optional, Tuple
+import numpy as np
 
-@dataclass
+# Codifica delle celle nella griglia delle lettere (array numpy uint8):
+# 0 = cella vuota, 1 = cella nera, 2..27 = lettere da 'A' a 'Z'
+EMPTY = 0
+BLACK = 1
+FIRST_LETTER = 2
+_CODE_OFFSET = ord('A') - FIRST_LETTER
+
+# Carattere delle celle vuote negli schemi di ricerca come "C_TT_"
+WILDCARD: Final = '_'
+
+# Tabella di classificazione: IS_LETTER[codice] è True solo per le lettere
+IS_LETTER = np.zeros(256, dtype=np.bool_)
+IS_LETTER[FIRST_LETTER:FIRST_LETTER + 26] = True
+
+# Tabella per bytes.translate: lettere in ASCII, celle vuote e nere in spazi
+CODES_TO_ASCII = bytes.maketrans(bytes(range(FIRST_LETTER + 26)),
+                                 b' ' * FIRST_LETTER + b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# Tabelle per bytes.translate tra i codici delle celle e i caratteri dei file salvati
+# (' ' vuota, '#' nera, lettere in ASCII)
+VALID_CHARS: Final = b' #ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+CODES_TO_CHARS = bytes.maketrans(bytes(range(FIRST_LETTER + 26)), VALID_CHARS)
+CHARS_TO_CODES = bytes.maketrans(VALID_CHARS, bytes(range(FIRST_LETTER + 26)))
+
+def encode_letter(letter: str) -> int:
+    """Converte il contenuto di una cella (' ', '#' o lettera) nel suo codice."""
+    if letter == ' ':
+        return EMPTY
+    if letter == '#':
+        return BLACK
+    return ord(letter) - _CODE_OFFSET
+
+def decode_letter(code: int) -> str:
+    """Converte un codice di cella nel carattere corrispondente."""
+    if code == EMPTY:
+        return ' '
+    if code == BLACK:
+        return '#'
+    return chr(code + _CODE_OFFSET)
+
+@dataclass(slots=True)
 class Word:
     text: str
     definitions: List[str]
+    # Riga della parola nelle tabelle codificate del WordIndex
+    id: int = field(default=-1, repr=False, compare=False)
+    # Posizioni di ogni lettera nel testo, calcolate una volta sola
+    letter_positions: Dict[str, Tuple[int, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        positions: Dict[str, List[int]] = {}
+        for i, letter in enumerate(self.text):
+            positions.setdefault(letter, []).append(i)
+        self.letter_positions = {letter: tuple(pos) for letter, pos in positions.items()}
 
-@dataclass
+@dataclass(slots=True)
 class CrosswordCell:
-    letter: str = ' '
-    number: int = None
+    """Attributi di una cella; la lettera è nell'array CrosswordGenerator.letters."""
+    number: Optional[int] = None
     is_start: bool = False
     is_horizontal: bool = False
-    is_vertical: bool = False
\ No newline at end of file
+    is_vertical: bool = False
@@ -1,25 +1,56 @@
+import json
 import requests
 import os
 
+# URL del file raw da GitHub
+WORDS_URL = "https://raw.githubusercontent.com/napolux/paroleitaliane/master/paroleitaliane/60000_parole_italiane.txt"
+WORDS_FILE = "data/parole_italiane.txt"
+# ETag e Last-Modified dell'ultimo download, per le richieste condizionali
+VALIDATORS_FILE = "data/.words_etag.json"
+
+def load_validators() -> dict:
+    """Legge ETag e Last-Modified salvati, se il file delle parole è presente."""
+    if not os.path.exists(WORDS_FILE):
+        return {}
+    try:
+        with open(VALIDATORS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 def download_word_list():
-    # URL del file raw da GitHub
-    url = "https://raw.githubusercontent.com/napolux/paroleitaliane/master/paroleitaliane/60000_parole_italiane.txt"
-    
     # Assicurati che la cartella data esista
     if not os.path.exists('data'):
         os.makedirs('data')
-    
-    # Scarica il file
+
+    # Richiesta condizionale: se il file non è cambiato il server risponde 304
+    validators = load_validators()
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    # Scarica il file in streaming, scrivendo i byte così come arrivano
     print("Scaricamento del file di parole...")
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        # Salva il file
-        with open('data/parole_italiane.txt', 'w', encoding='utf-8') as f:
-            f.write(response.text)
-        print("File scaricato con successo in data/parole_italiane.txt")
-    else:
-        print(f"Errore nel download: {response.status_code}")
+    with requests.get(WORDS_URL, headers=headers, stream=True) as response:
+        if response.status_code == 304:
+            print(f"Il file {WORDS_FILE} è già aggiornato")
+            return
+        response.raise_for_status()
+
+        with open(WORDS_FILE + ".part", 'wb') as f:
+            for chunk in response.iter_content(chunk_size=65536):
+                f.write(chunk)
+        os.replace(WORDS_FILE + ".part", WORDS_FILE)
+
+        with open(VALIDATORS_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }, f)
+
+    print(f"File scaricato con successo in {WORDS_FILE}")
 
 if __name__ == "__main__":
-    download_word_list()
\ No newline at end of file
+    download_word_list()
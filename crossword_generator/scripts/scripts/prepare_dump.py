@@ -0,0 +1,128 @@
+import bz2
+import os
+import re
+import sqlite3
+import requests
+import xml.etree.ElementTree as ET
+
+DUMP_URL = "https://dumps.wikimedia.org/itwiki/latest/itwiki-latest-pages-articles.xml.bz2"
+DUMP_FILE = "data/itwiki-latest-pages-articles.xml.bz2"
+DB_FILE = "data/wiki_dump.sqlite"
+
+# Solo i titoli composti da una singola parola possono servire al cruciverba
+TITLE_RE = re.compile(r"[^\W\d_]{2,15}")
+
+# Pulizia (approssimata) del wikitesto della voce
+TEMPLATE_RE = re.compile(r"\{\{[^{}]*\}\}")
+TABLE_RE = re.compile(r"\{\|.*?\|\}", re.DOTALL)
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+REF_RE = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
+MEDIA_RE = re.compile(r"\[\[(?:File|Immagine|Image|Categoria|Category):[^\[\]]*(?:\[\[[^\[\]]*\]\][^\[\]]*)*\]\]",
+                      re.IGNORECASE)
+LINK_RE = re.compile(r"\[\[(?:[^\[\]|]*\|)?([^\[\]]*)\]\]")
+EXTERNAL_LINK_RE = re.compile(r"\[https?://[^\s\]]+\s*([^\]]*)\]")
+QUOTES_RE = re.compile(r"'{2,}")
+
+def download_dump():
+    """Scarica il dump delle voci di Wikipedia in italiano, se non è già presente."""
+    if os.path.exists(DUMP_FILE):
+        print(f"Dump già presente in {DUMP_FILE}")
+        return
+    
+    if not os.path.exists('data'):
+        os.makedirs('data')
+    
+    print("Scaricamento del dump di Wikipedia (diversi GB)...")
+    with requests.get(DUMP_URL, stream=True) as response:
+        response.raise_for_status()
+        with open(DUMP_FILE + ".part", 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    os.replace(DUMP_FILE + ".part", DUMP_FILE)
+    print(f"Dump scaricato in {DUMP_FILE}")
+
+def first_sentence(wikitext: str) -> str:
+    """Estrae la prima frase in testo semplice dal wikitesto di una voce."""
+    text = COMMENT_RE.sub('', wikitext)
+    text = REF_RE.sub('', text)
+    text = TABLE_RE.sub('', text)
+    # I template possono essere annidati: rimuovi dall'interno verso l'esterno
+    previous = None
+    while previous != text:
+        previous = text
+        text = TEMPLATE_RE.sub('', text)
+    text = MEDIA_RE.sub('', text)
+    text = LINK_RE.sub(r'\1', text)
+    text = EXTERNAL_LINK_RE.sub(r'\1', text)
+    text = QUOTES_RE.sub('', text)
+    text = TAG_RE.sub('', text)
+    
+    # Il primo paragrafo di testo è l'incipit della voce
+    for line in text.splitlines():
+        line = line.strip()
+        if line and line[0] not in '=*#:;|!{}[':
+            return line.partition('.')[0].strip()
+    return ""
+
+def iter_pages(path: str):
+    """Scorre il dump in streaming restituendo (titolo, wikitesto) delle voci."""
+    with bz2.open(path, 'rb') as f:
+        title = text = None
+        namespace = None
+        is_redirect = False
+        root = None
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                # Il primo elemento è la radice <mediawiki>, che accumula le voci lette
+                if root is None:
+                    root = elem
+                continue
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == "title":
+                title = elem.text
+            elif tag == "ns":
+                namespace = elem.text
+            elif tag == "redirect":
+                is_redirect = True
+            elif tag == "text":
+                text = elem.text
+            elif tag == "page":
+                if namespace == "0" and not is_redirect and title and text:
+                    yield title, text
+                title = text = namespace = None
+                is_redirect = False
+                # Stacca le voci già lette dalla radice: la memoria resta costante
+                root.clear()
+
+def build_database():
+    """Crea l'indice sqlite titolo -> prima frase a partire dal dump."""
+    conn = sqlite3.connect(DB_FILE)
+    conn.execute("DROP TABLE IF EXISTS defs")
+    conn.execute("CREATE TABLE defs (word TEXT PRIMARY KEY, title TEXT, definition TEXT)")
+    
+    print("Estrazione delle definizioni dal dump...")
+    rows = []
+    count = 0
+    for title, text in iter_pages(DUMP_FILE):
+        if not TITLE_RE.fullmatch(title):
+            continue
+        definition = first_sentence(text)
+        if not definition:
+            continue
+        
+        rows.append((title.upper(), title, definition))
+        if len(rows) >= 10000:
+            conn.executemany("INSERT OR IGNORE INTO defs VALUES (?, ?, ?)", rows)
+            count += len(rows)
+            rows = []
+            print(f"{count} voci elaborate...")
+    
+    conn.executemany("INSERT OR IGNORE INTO defs VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    print(f"Database creato in {DB_FILE}")
+
+if __name__ == "__main__":
+    download_dump()
+    build_database()